@@ -1,18 +1,34 @@
+import argparse
+import os
 import random
+import sys
+import time
 from random import choice
 
+# the solver lives in the shared puzzle_core package at the top of the repository.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from puzzle_core.bitboard import GOALS, decode, encode, move_table, slide
+from puzzle_core.difficulty import LONGEST_3X3, generate_by_difficulty, parse_lengths
+from puzzle_core.generator import generate_new_puzzle as shuffled_puzzle
+from puzzle_core.oracle import open_oracle
+
+oracle = None  # the fewest moves left from every board, memory-mapped by the first game so importing stays cheap
+difficulty = None  # (fewest, most) moves of the boards' optimal solutions, any board when None
+say = print  # where the game writes its messages, silenced in script mode
+read = input  # where the game reads the player's answers, fed from a file in script mode
+
 
 def intro():
     # introduction of this game
-    print("Welcome to Kinley’s puzzle game, you will be prompted: ")
-    print("The Kinley’s puzzle game is a classic puzzle that consists of a 3x3 grid with eight\
+    say("Welcome to Kinley’s puzzle game, you will be prompted: ")
+    say("The Kinley’s puzzle game is a classic puzzle that consists of a 3x3 grid with eight\
 numbered square tiles and an empty space. ")
-    print("You need to sliding one adjacent tile into the empty space until all numbers appear sequentially,\
+    say("You need to sliding one adjacent tile into the empty space until all numbers appear sequentially,\
 ordered from left to right and top to bottom.")
 
 
 def enter_letters(moves,move_representation):
-    movesinput=input("Enter the four letters used for left, right, up and down move:")
+    movesinput=read("Enter the four letters used for left, right, up and down move:")
     count=0
     moveset=[[0,1],[0,-1],[1,0],[-1,0]]
     # check if the input is vaild.Repeated letters,too many or too few letters, non-letter characters are invaild.
@@ -23,149 +39,212 @@ def enter_letters(moves,move_representation):
                 move_representation.append(i)#arrow directions are determined by the entered letters.
                 count+=1
     if count<4:  #tackle invalid input
-        print("invalid input, please try again!")
+        say("invalid input, please try again!")
         return False
     else:
         return True
 
 
 def generate_new_puzzle():
-    while True:
-        puzzle = [1, 2, 3, 4, 5, 6, 7, 8, 0]  # 生成新的游戏拼图
-        random.shuffle(puzzle)  # 随机打乱拼图
-        if is_solvable(puzzle):  # 检查拼图是否可解
-            return puzzle
+    if difficulty is not None:# a board whose shortest solution has the asked number of moves
+        return generate_by_difficulty(3, *difficulty, random)
+    # shuffled once, an unsolvable shuffle gets its parity repaired instead of being shuffled again.
+    return shuffled_puzzle(3, random)
 
 
-def is_solvable(puzzle):
-    count = 0
-    for i in range(0, 9):
-        for j in range(i+1, 9):
-            if puzzle[i] > puzzle[j]:
-                count += 1
-    return count % 2 == 0  # 如果逆序数为偶数，则拼图可解，否则不可解
-
 def print_puzzle(puzzle):
     # print the checkerboard
-    for i in  range(len(puzzle)):
-        for j in range(len(puzzle[i])):
-            if puzzle[i][j]!=0:
-                print(puzzle[i][j],end=" ")
+    cells=decode(puzzle,3)
+    for i in range(3):
+        for j in range(3):
+            if cells[i*3+j]!=0:
+                say(cells[i*3+j],end=" ")
             else:
-                print(" ",end=" ")
-        print()
-    print()
-
-
-def person_input(puzzle,moves,empty,move_representation,new_empty):
-    # let the user know what positions can he moves to.
-    possilbe_solution = "Enter your move (left-" + move_representation[0] + ", right-" + move_representation[1] + \
-                        ", up-" + move_representation[2] + ", down-" + move_representation[3] + ") >"
-    # judge if the move can be done. If not, delete the move.
-    if empty[1] == len(puzzle) - 1:
-        possilbe_solution = possilbe_solution.replace("left-" + move_representation[0] + ", ", "")
-    if empty[1] == 0:
-        possilbe_solution = possilbe_solution.replace("right-" + move_representation[1] + ", ", "")
-    if empty[0] == len(puzzle) - 1:
-        possilbe_solution = possilbe_solution.replace("up-" + move_representation[2] + ", ", "")
-    if empty[0] == 0:
-        possilbe_solution = possilbe_solution.replace(", down-" + move_representation[3], "")
-    solution = input(possilbe_solution)
-    global flag
-    try:
-        if_valid=moves[solution]
-    except:
-        print("invalid input, please try again!")
+                say(" ",end=" ")
+        say()
+    say("Fewest moves left:", oracle.distance(cells))
+    say()
+
+
+def letter_table(moves,move_representation):
+    # for every position of the empty space: the prompt to show and where each allowed letter sends the empty space.
+    names=["left","right","up","down"]
+    table=[]
+    for blank,legal in enumerate(move_table(3)):
+        prompt=[]
+        targets={}
+        for name,letter in zip(names,move_representation):
+            target=blank+moves[letter][0]*3+moves[letter][1]
+            for move in legal:# the precomputed moves never wrap around a row
+                if move[0]==target:
+                    targets[letter]=move
+                    prompt.append(name+"-"+letter)
+        table.append(("Enter your move (" + ", ".join(prompt) + ", or hint, solve) >",targets))
+    return table
+
+
+def hint_letter(puzzle,table,empty):
+    # translate the solver's next position of the empty space into the player's letter.
+    new_position = oracle.next_move(decode(puzzle,3))
+    for letter,move in table[empty][1].items():
+        if move[0]==new_position:
+            return letter
+
+
+def person_input(puzzle,table,empty,auto_moves):
+    # let the user know what positions can he moves to, return the chosen move or False.
+    possilbe_solution,targets=table[empty]
+    solution = read(possilbe_solution)
+    if solution == "hint":
+        say("Hint: try", hint_letter(puzzle,table,empty))
         return False
-    try:
-        new_empty[0]= empty[0] + moves[solution][0]
-        new_empty[1] = empty[1] + moves[solution][1]
-    except:
-        print("invalid input, please try again!")
+    if solution == "solve":
+        # queue the optimal moves, play_game() plays them one by one.
+        auto_moves.extend(oracle.solution(decode(puzzle,3)))
         return False
-    if new_empty[0]>2 or new_empty[0]<0 or new_empty[1]>2 or new_empty[1]<0:
-        print("invalid input, please try again!")
+    # judge if the move can be done: unknown letters and moves off the board are both missing from the table.
+    if solution not in targets:
+        say("invalid input, please try again!")
         return False
-    return True
+    return targets[solution]
 
 
-def person_move(puzzle,empty,new_empty):
-    # change the position of the number.
-    puzzle[empty[0]][empty[1]] = puzzle[new_empty[0]][new_empty[1]]
-    puzzle[new_empty[0]][new_empty[1]] = 0
+def person_move(puzzle,move):
+    # change the position of the number, return the new board.
+    target,target_shift,blank_shift=move
+    puzzle=slide(puzzle,target_shift,blank_shift)
     print_puzzle(puzzle)
+    return puzzle
 
 
 def person_choice():
     #When the game finishes, let the player to choose whether start a new game or quite the game.
-    person_choice=input("Enter “n” for another game, or “q” to end the game >")
-    if person_choice=="n":
-        main()
-    elif person_choice=="q":
-        return True
+    person_choice=read("Enter “n” for another game, or “q” to end the game >")
+    if person_choice=="n" or person_choice=="q":
+        return person_choice
     else:
-        print("invalid input, please try again!")
+        say("invalid input, please try again!")
         return False
 
 
 def check_win(puzzle):
-    # generate the final checkerboard to compare with the current one.
-    checking=[[0 for i in range(len(puzzle))] for j in range(len(puzzle[0]))]
-    count=0
-    for i in range(len(checking)):
-        for j in range(len(checking[i])):
-            count+=1
-            checking[i][j]=count
-    checking[len(puzzle)-1][len(puzzle[0])-1]=0
-    if checking==puzzle:
-        return True
-    else:
-        return False
+    # the whole board is one number, so it is compared with the final checkerboard at once.
+    return puzzle==GOALS[3]
 
 
-def main():
-    # introduction of this game
-    intro()
-    # let the user enter 4 letters representing 4 directions.
-    #moves={}#connect the directions with the entered letters.
-    #move_representation=[]
-    flag1=False# The flag is used to indicate whether the player has entered the appropriate 4 letters.
-    while flag1==False:# If the player entered the invalid letter(s), then they should enter again.
-        moves = {}#connect the directions with the entered letters.
-        move_representation = []#store the entered letters.
-        flag1=enter_letters(moves,move_representation)
-    #set the size of the puzzle
+def play_game(moves,move_representation):
+    # play one game with the given letters, return whether it was solved and how many moves were made.
+    global oracle
+    if oracle is None:# the table ships with puzzle_core, so this only maps the file
+        oracle=open_oracle()
     originpuzzle=generate_new_puzzle()
-    len_board=3
-    puzzle = [[originpuzzle[i*len_board+j] for i in range(len_board)] for j in range(3)]
-    print(puzzle)
-    puzzle[len(puzzle)-1][len(puzzle[0])-1]=0# the initial space represented by zero is in the place of number nine
-    empty = [len(puzzle)-1 for i in range(len(puzzle)-1)]# the position of the initial empty
+    # the board is packed into one number, four bits per square read row by row.
+    puzzle = encode(originpuzzle)
+    print_puzzle(puzzle)
+    empty = originpuzzle.index(0)# the position of the initial empty
+    table=letter_table(moves,move_representation)
     count=0#Total steps calculation
+    auto_moves=[]# moves queued by the "solve" command
     # the process of the game
-    while not check_win(puzzle):
-        new_empty=[0,0]
-        flag=False# The flag is used to indicate whether the player has entered the appropriate direction to move.
-        while flag==False:# If the player entered the invalid directions or meaningless words, then they should enter again.
-            new_empty = [0, 0]
-            # let the user know what positions can he moves to.
-            flag=person_input(puzzle,moves, empty, move_representation,new_empty)
-        person_move(puzzle,empty,new_empty)
-        count+=1
-        empty[0] = new_empty[0]
-        empty[1] = new_empty[1]
+    try:
+        while not check_win(puzzle):
+            move=False# The move stays False until the player has entered an appropriate direction.
+            while move==False:# If the player entered the invalid directions or meaningless words, then they should enter again.
+                if auto_moves:
+                    target=auto_moves.pop(0)
+                    move=[legal for legal in move_table(3)[empty] if legal[0]==target][0]
+                    break
+                # let the user know what positions can he moves to.
+                move=person_input(puzzle,table,empty,auto_moves)
+            puzzle=person_move(puzzle,move)
+            count+=1
+            empty=move[0]
+    except EOFError:# the input ended before the puzzle was solved
+        return False,count
     # thus the puzzle is solved (distinguish sigular and plural cases).
     if count==1:
-        print("Congratulations! You solved the puzzle in %d move!" % (count))
+        say("Congratulations! You solved the puzzle in %d move!" % (count))
     else:
-        print("Congratulations! You solved the puzzle in %d moves!"%(count))
-    flag3=False
-    while flag3==False:
-        flag3=person_choice()
-    return
-
-
-#start the program
-main()
+        say("Congratulations! You solved the puzzle in %d moves!"%(count))
+    return True,count
 
 
+def main():
+    # games are played one after another in this loop, so a long session never grows the call stack.
+    while True:
+        # introduction of this game
+        intro()
+        # let the user enter 4 letters representing 4 directions.
+        flag1=False# The flag is used to indicate whether the player has entered the appropriate 4 letters.
+        while flag1==False:# If the player entered the invalid letter(s), then they should enter again.
+            moves = {}#connect the directions with the entered letters.
+            move_representation = []#store the entered letters.
+            flag1=enter_letters(moves,move_representation)
+        play_game(moves,move_representation)
+        flag3=False
+        while flag3==False:
+            flag3=person_choice()
+        if flag3=="q":
+            return
+
+
+def script_tokens(line):
+    # one answer per letter, except the whole words "hint" and "solve".
+    for word in line.split():
+        if word=="hint" or word=="solve":
+            yield word
+        else:
+            yield from word
+
+
+def run_script(lines,seed):
+    # play games without a player: the first line holds the four letters, every other line the moves of one game.
+    global say, read
+    random.seed(seed)
+    say = lambda *args, **kwargs: None
+    lines = iter(lines)
+    letters = next(lines, "")
+    read = lambda prompt="": letters
+    moves = {}
+    move_representation = []
+    if not enter_letters(moves,move_representation):
+        print("invalid letters:", letters.strip())
+        return
+    games=0
+    solved_games=0
+    start=time.perf_counter()
+    for line in lines:
+        tokens = script_tokens(line)
+
+        def read(prompt=""):
+            # the game's answers come from this line, running out of them means giving up.
+            try:
+                return next(tokens)
+            except StopIteration:
+                raise EOFError from None
+
+        solved,count=play_game(moves,move_representation)
+        games+=1
+        solved_games+=solved
+        print("game %d: %s in %d moves" % (games, "solved" if solved else "unsolved", count))
+    elapsed=time.perf_counter()-start
+    print("%d games, %d solved, %.3f s (%.0f games/s)" % (games, solved_games, elapsed, games/elapsed if elapsed else 0))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Kinley's puzzle game.")
+    parser.add_argument("--script", metavar="FILE", help="play games from FILE ('-' for stdin) instead of a player")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for the boards in script mode")
+    parser.add_argument("--moves", type=parse_lengths, metavar="K|LOW-HIGH",
+                        help="only deal boards whose shortest solution takes K moves, or LOW to HIGH moves")
+    args = parser.parse_args()
+    if args.moves is not None and args.moves[0] > LONGEST_3X3:# checked here, not after the intro of the first game
+        parser.error("no 3x3 board needs more than %d moves" % LONGEST_3X3)
+    difficulty = args.moves
+    if args.script is None:
+        main()
+    elif args.script == "-":
+        run_script(sys.stdin,args.seed)
+    else:
+        with open(args.script) as script:
+            run_script(script,args.seed)
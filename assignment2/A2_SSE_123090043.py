@@ -1,86 +1,43 @@
 '''
 step1: Use the prompt_player() to get the size of the sliding puzzle.
-step2: Use a list called puzzle to store the solvable puzzle, and find the index of the empty.
-step3: Generate and display the initial statement of the game to players. Use len_board**2-2 turtles in total.
-step4: Use onclick() to receive the user's input with mouse clicking and run the mouse_click().
-step5: Find which tile the player clicked. If the tile is valid to move, then execute the move_tile() to move the turtle
-and execute the move_empty() to move the puzzle. Step 5 will be repeated until the puzzle is solved.
-step6: When the puzzle is solved, namely the return of is_solved() is true, change the color of the tiles to red.
+step2: Use a MeteredBoard called board to store the solvable puzzle and the index of the empty.
+step3: Generate and display the initial statement of the game to players. Use len_board**2-2 turtles in total,
+created in one batch with the screen's tracer off.
+step4: Use onclick() to receive the user's input with mouse clicking, and queue each click in mouse_click().
+step5: apply_clicks() takes the clicks in order and finds which tile the player clicked. If the tile is valid to move,
+then execute the move_tile() to move the turtle and execute board.move_empty() to move the puzzle, and draw one frame
+for all the queued clicks. Step 5 will be repeated until the puzzle is solved.
+step6: When the puzzle is solved, namely board.is_solved() is true, change the color of the tiles to red.
+Above the board, show_distance() keeps a live count of the moves left at least, which the board updates on every move.
 '''
 
 
-import random
+import argparse
+import os
+import sys
+import time
 import turtle
-
-
-def generate_new_puzzle(len_board: int) -> list:
-    """
-    Generate a solvable puzzle for players.
-
-    Args:
-    len_board (int): the size of the puzzle
-
-    Returns:
-    list: the puzzle
-    """
-    while True:
-        puzzle = [i for i in range(len_board ** 2)]
-        random.shuffle(puzzle)
-        if is_solvable(puzzle) and not is_solved(puzzle):
-            return puzzle
-
-
-def is_solvable(puzzle: list) -> bool:
-    """
-    Check whether the puzzle is solvable.
-
-    Args:
-    puzzle (list): A list containing the numbers in the sliding puzzle.
-
-    Returns:
-    bool: If the puzzle is solvable, return True. If the puzzle isn't solvable, return False.
-    """
-    count = 0
-    for i in range(len(puzzle)):
-        for j in range(i + 1, len(puzzle)):
-            if puzzle[i] > puzzle[j] != 0 and puzzle[i] != 0:
-                count += 1
-    # n is odd, inverse logarithm is even
-    if len_board % 2 == 1:
-        return count % 2 == 0
-    # n is even, the inverse-order logarithm is parity with the row distance between the initial and final position of
-    # the empty tile.
-    else:
-        empty_dist = abs((len_board ** 2 - puzzle.index(0) - 1) // len_board)
-        return (count % 2 == 0) == (empty_dist % 2 == 0)
-
-
-def is_solved(puzzle: list) -> bool:
-    """
-    Check whether the puzzle is solved.
-
-    Args:
-    puzzle (list): A list containing the numbers in the sliding puzzle.
-
-    Returns:
-    bool: If the puzzle is solved, return True. If the puzzle isn't solved, return False.
-    """
-    ordered_puzzle = [i + 1 for i in range(len_board ** 2)]
-    ordered_puzzle[len_board ** 2 - 1] = 0
-    if puzzle == ordered_puzzle:
-        return True
-    else:
-        return False
-
-
-def move_empty(new_empty: int) -> None:
-    """
-    change the empty in the list of puzzle.
-
-    Args:
-    new_empty (int): A list containing the numbers in the sliding puzzle.
-    """
-    puzzle[empty], puzzle[new_empty] = puzzle[new_empty], puzzle[empty]
+from collections import deque
+
+# the headless puzzle logic lives in the shared puzzle_core package at the top of the repository.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from puzzle_core.board import MeteredBoard
+from puzzle_core.difficulty import generate_by_difficulty, parse_lengths, prepare
+from puzzle_core.generator import generate_new_puzzle
+
+TILE_SIZE = 80  # width of a tile in pixels, a multiple of the 20-pixel turtle square
+TILE_SPACE = 10  # gap between two tiles in pixels
+FRAME_TIME = 1 / 60  # one frame of a 60 Hz display in seconds
+BOARD_SPAN = 540  # the widest the board may be in pixels, larger boards get smaller tiles
+MAX_SIZE = 10  # the largest board the player can ask for
+DIFFICULTY_SIZES = (3, 4)  # the boards whose shortest solutions are quick enough to verify at startup
+STARTUP_BUDGET = 0.1  # time from the chosen size to a board that takes clicks, in seconds
+STARTUP_NODES = 20_000  # search nodes a 4x4 --moves board may cost, about 60 ms
+METER_FONT = ("Arial", 18, "normal")
+METER_GAP = 16  # space between the top of the board and the distance meter in pixels
+DIGIT_WIDTH, DIGIT_HEIGHT, DIGIT_THICK, DIGIT_GAP = 22, 44, 6, 6  # seven-segment numbers in pixels
+SEGMENTS = {"0": "abcdef", "1": "bc", "2": "abdeg", "3": "abcdg", "4": "bcfg",
+            "5": "acdfg", "6": "acdefg", "7": "abc", "8": "abcdefg", "9": "abcdfg"}
 
 
 '''
@@ -97,7 +54,7 @@ def prompt_player() -> int:
     """
     screen.bgcolor("lightblue")
     screen.title("Kinley's Puzzle")
-    game_size = screen.numinput("Kinley's Puzzle", "Puzzle Dimension >", default=3, minval=3, maxval=5)
+    game_size = screen.numinput("Kinley's Puzzle", "Puzzle Dimension >", default=3, minval=3, maxval=MAX_SIZE)
     try:
         game_size = int(game_size)
     except:
@@ -105,138 +62,301 @@ def prompt_player() -> int:
     return game_size
 
 
-def create_a_tile(color: str = "blue", sz: int = 4, border: int = 5) -> turtle.Turtle:
+def digit_polygons(number: int) -> list:
     """
-    Creates a turtle object configured as a square tile.
+    Build the seven-segment polygons that spell a number, centred on (0, 0).
 
     Args:
-    color (str): The color of the tile.
-    sz (int): The size of the tile.
-    border (int): The width of the tile border.
+    number (int): The number to spell.
 
     Returns:
-    turtle.Turtle: A turtle object configured as a square tile with the given size and border width.
+    list: One rectangle per lit segment, each a tuple of four (x, y) offsets with y pointing up.
     """
-    t_a_tile = turtle.Turtle('square')
-    t_a_tile.up()
-    t_a_tile.pencolor(color)
-    t_a_tile.color(color)
-    t_a_tile.shapesize(sz, sz, border)
-    return t_a_tile
+    width, height, thick = DIGIT_WIDTH, DIGIT_HEIGHT, DIGIT_THICK
+    boxes = {
+        "a": (-width / 2, height / 2 - thick, width / 2, height / 2),
+        "b": (width / 2 - thick, 0, width / 2, height / 2),
+        "c": (width / 2 - thick, -height / 2, width / 2, 0),
+        "d": (-width / 2, -height / 2, width / 2, -height / 2 + thick),
+        "e": (-width / 2, -height / 2, -width / 2 + thick, 0),
+        "f": (-width / 2, 0, -width / 2 + thick, height / 2),
+        "g": (-width / 2, -thick / 2, width / 2, thick / 2),
+    }
+    digits = str(number)
+    pitch = width + DIGIT_GAP
+    polygons = []
+    for i, digit in enumerate(digits):
+        shift = (i - (len(digits) - 1) / 2) * pitch
+        for segment in SEGMENTS[digit]:
+            x0, y0, x1, y1 = boxes[segment]
+            polygons.append(((x0 + shift, y0), (x1 + shift, y0), (x1 + shift, y1), (x0 + shift, y1)))
+    return polygons
+
+
+def tile_shape(number: int, color: str) -> str:
+    """
+    Register, once, a compound shape of a coloured tile with its number drawn on it.
 
+    Args:
+    number (int): The number on the tile.
+    color (str): The color of the tile.
 
-def create_a_number(color: str = "black") -> turtle.Turtle:
+    Returns:
+    str: The name of the registered shape.
     """
-    Creates a turtle object configured as a number.
+    name = f"tile {number} {color}"
+    if name not in registered_shapes:
+        shape = turtle.Shape("compound")
+        half = TILE_SIZE / 2 + 2
+        outline = ((-half, -half), (half, -half), (half, half), (-half, half))
+        # a turtle shape at heading 0 draws its point (x, y) at screen offset (y, -x)
+        shape.addcomponent([(-y, x) for x, y in outline], color, color)
+        for polygon in digit_polygons(number):
+            shape.addcomponent([(-y, x) for x, y in polygon], "black", "black")
+        screen.register_shape(name, shape)
+        registered_shapes.add(name)
+    return name
+
+
+def create_a_tile(number: int, color: str = "green") -> turtle.Turtle:
+    """
+    Creates a turtle object shaped as a numbered square tile, stretched to the board's scale.
 
     Args:
-    color (str): The color of the number.
+    number (int): The number on the tile.
+    color (str): The color of the tile.
 
     Returns:
-    turtle.Turtle: A turtle object is going to be configured as a number with given color.
+    turtle.Turtle: A turtle object that draws the tile and its number in one shape.
     """
-    t_a_number = turtle.Turtle('square')
-    t_a_number.color(color)
-    return t_a_number
+    t_a_tile = turtle.Turtle(tile_shape(number, color))
+    t_a_tile.up()
+    t_a_tile.shapesize(scale)
+    return t_a_tile
 
 
-def display_tiles(color: str = "green", space: int = 10) -> tuple:
+def display_tiles(color: str = "green", space: int = TILE_SPACE) -> list:
     """
-    Displays a grid of tile and number objects on the screen.
+    Creates a grid of numbered tiles in one batch.
+
+    Every tile shape is registered first, then the tiles are created and put
+    in place. Nothing is drawn while the screen's tracer is off, so the whole
+    board appears with the next screen.update().
 
     Args:
-    color (str): The color of the number.
-    space (int): spacing between tiles in pixels
+    color (str): The color of the tiles.
+    space (int): spacing between tiles in pixels, before scaling.
 
     Returns:
-    tuple:The first list is a list of the Turtle objects created for the tiles.
-        The second list is a list of the Turtle objects created for the printed numbers.
+    list: The Turtle objects created for the tiles, with 0 in the place of the empty.
     """
-    t = create_a_tile()
-    t_number = create_a_number()
-    tiles_number = []
-    sz = 80 + space
+    pitch = (TILE_SIZE + space) * scale
+    for number in range(1, len(board)):
+        tile_shape(number, color)
     tiles = []
-    turtle.delay(0)
-    count = 0
-    # create tiles and numbers from top to bottom, left to right.
-    for cy in range(y_origin, y_origin - sz * len_board, - sz):
-        for cx in range(x_origin, x_origin + sz * len_board, sz):
-            if count != empty:
-                t.color(color)
-                t.goto(cx, cy)
-                tiles.append(t)
-                t = t.clone()
-                t_number.penup()
-                t_number.goto(cx, cy - 35)
-                t_number.pendown()
-                t_number.hideturtle()
-                # Display number on tile with custom text color
-                t_number.write(puzzle[count], align="center", font=("Arial", 48, "normal"))
-                tiles_number.append(t_number)
-                t_number = t_number.clone()
-                count += 1
-            else:
-                tiles.append(0)
-                count += 1
-                tiles_number.append(0)
-            tile_positions.append([cx, cy])
-    t.hideturtle()
-    turtle.delay(2)
-    return tiles, tiles_number
+    # create tiles from top to bottom, left to right.
+    for count in range(len(board)):
+        row, col = divmod(count, len_board)
+        cx, cy = x_origin + col * pitch, y_origin - row * pitch
+        tile_positions.append([cx, cy])
+        if count == board.empty:
+            tiles.append(0)
+            continue
+        t = create_a_tile(board[count], color)
+        t.goto(cx, cy)
+        tiles.append(t)
+    return tiles
+
+
+def paint_tiles(color: str) -> None:
+    """
+    Change the color of every tile by switching it to the matching shape.
+
+    Args:
+    color (str): The new color of the tiles.
+    """
+    for i, t in enumerate(tiles):
+        if t:
+            t.shape(tile_shape(board[i], color))
+
+
+def create_meter() -> turtle.Turtle:
+    """
+    Creates the hidden turtle that writes the distance meter, centred above the board.
+
+    Returns:
+    turtle.Turtle: The turtle that show_distance() writes with.
+    """
+    t_meter = turtle.Turtle(visible=False)
+    t_meter.up()
+    t_meter.goto(0, y_origin + TILE_SIZE * scale / 2 + METER_GAP)
+    return t_meter
+
+
+def show_distance() -> None:
+    """
+    Write how many moves the board needs at least, from the estimate the board keeps itself.
+
+    The estimate is the Manhattan distance plus linear conflicts, updated by
+    board.move_empty() from the moved tile and its two lines alone, so the
+    meter costs one text item per frame whatever the size of the board.
+    """
+    meter.clear()
+    left = board.estimate
+    text = f"At least {left} move{'s' if left > 1 else ''} to go" if left else "Solved!"
+    meter.write(text, align="center", font=METER_FONT)
 
 
 def move_tile(new_empty: int) -> None:
     """
     move a tile object on the screen.
 
+    The number is part of the tile's shape, so it moves along without being written again.
+
     Args:
-    new_empty (int): new_empty (int): A list containing the numbers in the sliding puzzle.
+    new_empty (int): The index of the tile that slides into the empty.
     """
-    tiles_number[new_empty].undo()
+    empty = board.empty
     tiles[new_empty].goto(tile_positions[empty])
     tiles[new_empty], tiles[empty] = tiles[empty], tiles[new_empty]
-    tiles_number[new_empty].penup()
-    tiles_number[new_empty].goto(tile_positions[empty][0], tile_positions[empty][1] - 35)
-    tiles_number[new_empty].pendown()
-    tiles_number[new_empty].write(puzzle[new_empty], align="center", font=("Arial", 48, "normal"))
-    tiles_number[new_empty], tiles_number[empty] = tiles_number[empty], tiles_number[new_empty]
+
+
+def clicked_cell(x: float, y: float, space: int = TILE_SPACE) -> int:
+    """
+    Find the cell under a click from the grid geometry, in constant time.
+
+    Args:
+    x (float): the x coordinate of the mouse click.
+    y (float): the y coordinate of the mouse click.
+    space (int): spacing between tiles in pixels, as passed to display_tiles().
+
+    Returns:
+    int: The index of the clicked cell, or -1 if the click is off the board or in a gap between tiles.
+    """
+    size = TILE_SIZE * scale
+    pitch = (TILE_SIZE + space) * scale
+    # distances from the top-left corner of the first tile
+    dx = x - x_origin + size / 2
+    dy = y_origin + size / 2 - y
+    col, offset_x = divmod(dx, pitch)
+    row, offset_y = divmod(dy, pitch)
+    if 0 <= col < len_board and 0 <= row < len_board and offset_x <= size and offset_y <= size:
+        return int(row) * len_board + int(col)
+    return -1
 
 
 def mouse_click(x: float, y: float) -> None:
     """
-        Handles mouse click events during the game.
+        Handles mouse click events during the game by queueing them with the time they came in.
+
+        The click handler stays bound the whole game, so a click that comes in
+        while a frame is being drawn waits in the queue instead of being lost.
 
         Args:
         x (int): the x coordinate of the mouse click.
         y (int): the y coordinate of the mouse click.
     """
-    global empty
-    turtle.onscreenclick(None)
-    for i in range(len_board ** 2):
-        if tile_positions[i][0] - 40 <= x <= tile_positions[i][0] + 40 \
-                and tile_positions[i][1] + 40 >= y >= tile_positions[i][1] - 40:
-            dist_x = abs(empty % len_board - i % len_board)
-            dist_y = abs(empty // len_board - i // len_board)
-            if dist_x + dist_y == 1:
-                move_tile(i)
-                move_empty(i)
-                empty = i
-    if is_solved(puzzle):
-        display_tiles(color="red")
-    else:
-        screen.onclick(mouse_click)
+    global drain_pending
+    click_queue.append((time.perf_counter(), x, y))
+    if not drain_pending:
+        drain_pending = True
+        screen.ontimer(apply_clicks, 0)
+
+
+def apply_clicks() -> None:
+    """
+    Apply every queued click in order, then draw one frame for all of them.
+
+    When clicks back up, e.g. during a slow redraw, they are all moved in one
+    go and the screen is redrawn once. The time from each click to the end of
+    the frame showing its move is recorded in frame_times.
+    """
+    global drain_pending
+    applied = []
+    while click_queue:
+        clicked, x, y = click_queue.popleft()
+        i = clicked_cell(x, y)
+        if i >= 0 and board.can_move(i):
+            move_tile(i)
+            board.move_empty(i)
+            applied.append(clicked)
+            if board.is_solved():
+                click_queue.clear()
+                screen.onclick(None)
+                paint_tiles("red")
+    if applied:
+        show_distance()
+    # clicks that come in while the frame is drawn start a new round
+    drain_pending = False
+    screen.update()
+    drawn = time.perf_counter()
+    frame_times.extend(drawn - clicked for clicked in applied)
+
+
+def report_frame_times() -> None:
+    """
+    Print the click-to-frame latency of the moves, and how many of them were drawn within one frame.
+    """
+    if frame_times:
+        ordered = sorted(frame_times)
+        in_frame = sum(1 for latency in ordered if latency <= FRAME_TIME)
+        print(f"{len(ordered)} moves: mean {1000 * sum(ordered) / len(ordered):.1f} ms, "
+              f"median {1000 * ordered[len(ordered) // 2]:.1f} ms, max {1000 * ordered[-1]:.1f} ms, "
+              f"{in_frame} within one {1000 * FRAME_TIME:.1f} ms frame")
+
+
+def report_startup_time(seconds: float) -> None:
+    """
+    Print the time from the chosen board size to a board drawn and taking clicks.
+    """
+    print(f"{len_board}x{len_board} board interactive in {1000 * seconds:.1f} ms "
+          f"({'within' if seconds <= STARTUP_BUDGET else 'over'} the {1000 * STARTUP_BUDGET:.0f} ms budget)")
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Kinley's puzzle game.")
+    parser.add_argument("--moves", type=parse_lengths, metavar="K|LOW-HIGH",
+                        help="deal a board whose shortest solution takes K moves, or LOW to HIGH moves "
+                             "(3x3 and 4x4 boards only)")
+    parser.add_argument("--frame-times", action="store_true", help="print the click-to-frame latency at exit")
+    parser.add_argument("--startup-time", action="store_true", help="print how long the board took to build")
+    args = parser.parse_args()
     screen = turtle.Screen()
     tile_positions = []
+    registered_shapes = set()
+    frame_times = []
+    click_queue = deque()  # (time, x, y) of the clicks not applied yet
+    drain_pending = False  # apply_clicks() is scheduled
     len_board = prompt_player()
-    puzzle = generate_new_puzzle(len_board)
-    empty = puzzle.index(0)
-    x_origin, y_origin = -80 - len_board * 20, 100 + len_board * 10
-    tiles, tiles_number = display_tiles()
+    dealing_by_moves = args.moves is not None and len_board in DIFFICULTY_SIZES
+    if dealing_by_moves:
+        # load the chosen size's tables outside the startup budget: milliseconds once cached,
+        # but the first 4x4 game builds its pattern database, about half a minute
+        prepare(len_board)
+    started = time.perf_counter()
+    board = None
+    if dealing_by_moves:
+        try:
+            board = MeteredBoard(len_board, generate_by_difficulty(len_board, *args.moves, max_nodes=STARTUP_NODES))
+        except (ValueError, RuntimeError) as error:
+            print(f"{error}, dealing a random board instead")
+    if board is None:
+        board = MeteredBoard(len_board, generate_new_puzzle(len_board))
+    # shrink the tiles of boards wider than BOARD_SPAN, and centre the board
+    scale = min(1.0, BOARD_SPAN / (len_board * (TILE_SIZE + TILE_SPACE)))
+    x_origin = -(len_board - 1) * (TILE_SIZE + TILE_SPACE) * scale / 2
+    y_origin = -x_origin
+    # the screen is only redrawn by hand: once for the whole board, then by apply_clicks() once per batch of clicks
+    screen.tracer(0)
+    tiles = display_tiles()
+    meter = create_meter()
+    show_distance()
+    screen.update()
     # Bind mouse click events.
     screen.onclick(mouse_click)
+    if args.startup_time:
+        report_startup_time(time.perf_counter() - started)
     # Enter the main event loop and wait for user action.
     screen.mainloop()
+    if args.frame_times:
+        report_frame_times()
@@ -5,16 +5,30 @@ The program performs the following steps:
 step1: Create screen, and show the introduction.Create snake, monsters, and store the position of snake,
         turtle of monsters in distinct lists. Detect click motion.
 step2: Use onkey() to detect the input, and change the moving direction of the snake. At the meantime,
-        by using the g_screen.ontimer(), move the snake, food, monster and calculate the time at the same time.
+        by using one fixed-tick game loop, move the snake, food, monster and calculate the time at the same time.
 step3: Each time the snake move detect the consumption of food. Each time the monster move, detect whether the
         monster collides into the snake's tail.
 step4: If the snake eats all of the food, or the monster collides into the snake's head, the game is over,
         and a corresponding subtitle will appear on the screen.
 """
+import argparse
+import os
+import sys
 import turtle
 import random
+import time
 from functools import partial
 
+# the headless game logic lives in the shared snake_core package at the top of the repository.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from snake_core.flow import FlowField
+from snake_core.grid import OccupancyGrid, SnakeBody
+from snake_core.loop import GameLoop
+from snake_core.replay import Recorder, read_log, replay
+from snake_core.spatial import SpatialHash
+from snake_core.terminal import KeyReader, TerminalRenderer, run
+from snake_core.timing import Profiler
+
 g_screen = None
 g_snake = None  # snake's head
 g_monster = None
@@ -24,32 +38,57 @@ g_key_pressed = None
 g_status = None
 g_total_time = 0
 g_start_game = False
-g_snake_items = []
-g_food_items = []
+g_grid = None  # occupancy of every cell of the play area
+g_snake_items = None  # SnakeBody: the snake's cells from tail to head
+g_food_items = {}  # cell -> [number, turtle]
 g_monster_items = []
+g_monsters = None  # SpatialHash of the monster turtles by cell
+g_flow = None  # FlowField leading the monsters to the snake's head
+g_food_jumps = None  # the cells two squares away from each cell, where food can move to
 g_movement = "Paused"
 g_contact = 0
 g_food_consumption = 0
 g_game_state = True
+g_loop = None  # GameLoop that runs the snake, monsters, food, contact check and clock
+g_status_dirty = False  # the status bar changed since the last frame
+g_terminal = None  # TerminalRenderer when the game is drawn in a terminal instead of a Tk window
+g_status_text = ""  # the status line of the terminal
+g_subtitle = None  # the game-over subtitle of the terminal
+g_rng = random.Random()  # every random choice of the game, seeded so that a game can be replayed
+g_recorder = None  # Recorder of the seed and the inputs when the game is recorded
+g_profiler = None  # Profiler of every timer callback when the game is profiled or traced
+g_readout = None  # turtle of the fps and latency readout
+g_readout_text = ""  # the fps and latency readout, empty unless profiling
+g_frame = None  # on_frame, timed when profiling
+g_draw = None  # the screen refresh, timed when profiling
 
 COLOR_BODY = ("blue", "black")
 COLOR_HEAD = "red"
 COLOR_MONSTER = "purple"
 FONT_INTRO = ("Arial", 18, "normal")
 FONT_STATUS = ("Arial", 17, "normal")
+FONT_READOUT = ("Arial", 9, "normal")
 TIMER_SNAKE = 200  # refresh rate for snake
+TIMER_TICK = 20  # length of one simulation tick, every timer is a whole number of ticks
 SZ_SQUARE = 20  # square size in pixels
 FOOD_NUMBER = 5
+MONSTER_NUMBER = 4
 
 DIM_PLAY_AREA = 500
 DIM_STAT_AREA = 60
 DIM_MARGIN = 30
+GRID_SIZE = DIM_PLAY_AREA // SZ_SQUARE  # cells along each side of the play area
+X_FIRST_CELL = -DIM_PLAY_AREA // 2 + SZ_SQUARE // 2  # x of the centre of the leftmost column
+Y_FIRST_CELL = -DIM_PLAY_AREA // 2 - DIM_STAT_AREA // 2 + 10 + SZ_SQUARE // 2  # y of the centre of the bottom row
 
 KEY_UP, KEY_DOWN, KEY_LEFT, KEY_RIGHT, KEY_SPACE = \
     "Up", "Down", "Left", "Right", "space"
 former_key_pressed = None
 
 HEADING_BY_KEY = {KEY_UP: 90, KEY_DOWN: 270, KEY_LEFT: 180, KEY_RIGHT: 0}
+STEP_BY_HEADING = ((1, 0), (0, 1), (-1, 0), (0, -1))  # column and row offsets of right, up, left, down
+
+GLYPH_STYLES = {"@": "1;31", "o": "34", "M": "1;35"}  # terminal colours of the head, body and monsters
 
 
 def create_turtle(x: int, y: int, color="red", border="black") -> turtle.Turtle:
@@ -72,6 +111,25 @@ def create_turtle(x: int, y: int, color="red", border="black") -> turtle.Turtle:
     return t
 
 
+def to_cell(x: float, y: float) -> int:
+    """
+    Return the grid cell whose centre is nearest to a point inside the play area.
+
+    Args:
+        x (float): The x-coordinate in pixels.
+        y (float): The y-coordinate in pixels.
+    """
+    return g_grid.index(round((x - X_FIRST_CELL) / SZ_SQUARE), round((y - Y_FIRST_CELL) / SZ_SQUARE))
+
+
+def to_xy(cell: int) -> tuple:
+    """
+    Return the pixel coordinates of the centre of a grid cell.
+    """
+    col, row = g_grid.col_row(cell)
+    return X_FIRST_CELL + col * SZ_SQUARE, Y_FIRST_CELL + row * SZ_SQUARE
+
+
 def configure_play_area() -> turtle.Screen:
     """
     Configures the play area for the snake game,
@@ -81,8 +139,8 @@ def configure_play_area() -> turtle.Screen:
     resized according to the specified dimensions.
 
     Returns:
-        tuples: A tuple containing the introduction text turtle and
-        the status text turtle.
+        tuples: A tuple containing the introduction text turtle,
+        the status text turtle and the readout text turtle.
     """
 
     # motion border
@@ -109,7 +167,12 @@ def configure_play_area() -> turtle.Screen:
     status.hideturtle()
     status.goto(-230, s.ycor() - 20)
 
-    return intro, status
+    # turtle to write the fps and latency readout, small in the top right corner of the status
+    readout = create_turtle(0, 0, "", "black")
+    readout.hideturtle()
+    readout.goto(240, s.ycor() + 10)
+
+    return intro, status, readout
 
 
 def configure_screen() -> turtle.Screen:
@@ -138,7 +201,6 @@ def update_status() -> None:
     """
     if not g_game_state:
         return
-    g_status.clear()
     if g_movement == "Move" and g_key_pressed is None:
         motion = "Paused"
     elif g_movement == "Paused":
@@ -146,26 +208,105 @@ def update_status() -> None:
     else:
         motion = g_key_pressed
     status = f'Contact-{g_contact}    Time-{g_total_time}    Motion-{motion}'
-    g_status.write(status, font=FONT_STATUS)
-    g_screen.update()
+    if g_screen is not None:
+        g_status.clear()
+        g_status.write(status, font=FONT_STATUS)
+    global g_status_dirty, g_status_text
+    g_status_text = status
+    g_status_dirty = True
+
+
+def update_readout() -> None:
+    """
+    Updates the fps and latency readout beside the status with the frames
+    drawn in the last second, and the 95th percentile of how long a frame
+    took and how late the snake's timer fired so far.
+
+        e.g. FPS-12  Frame-0.5ms  Jitter-16.4ms
+    """
+    global g_readout_text, g_status_dirty
+    frame = g_profiler.latency["frame" if g_screen is not None else "draw"].percentile(95)
+    jitter = g_profiler.jitter["on_timer_snake"].percentile(95)
+    g_readout_text = f"FPS-{g_profiler.rate('draw'):.0f}  Frame-{frame * 1000:.1f}ms  Jitter-{jitter * 1000:.1f}ms"
+    if g_screen is not None:
+        g_readout.clear()
+        g_readout.write(g_readout_text, align="right", font=FONT_READOUT)
+    g_status_dirty = True
+
+
+def timed(callback, name: str = None):
+    """
+    Returns the callback timed by the profiler, or the callback itself when the game is not profiled.
+
+    Args:
+        callback: A timer callback that returns its next delay in milliseconds, or None.
+        name (str, optional): The name in the profile. Defaults to the callback's name.
+    """
+    if g_profiler is None:
+        return callback
+    return g_profiler.wrap(callback, name)
+
+
+def on_frame() -> int:
+    """
+    Runs one frame of the game loop.
+
+    Every subsystem that is due by the monotonic clock is advanced, then the
+    screen is redrawn once if anything changed.
+
+    Returns:
+        int: The delay in milliseconds to the following tick boundary, or None once the loop is empty.
+    """
+    global g_status_dirty
+    if g_loop.advance() or g_status_dirty:
+        g_status_dirty = False
+        g_draw()
+    if len(g_loop):
+        return g_loop.next_delay_ms()
+    return None
+
+
+def on_tick() -> None:
+    """
+    Runs a frame and schedules the next one at the delay it asks for.
+    """
+    delay = g_frame()
+    if delay is not None:
+        g_screen.ontimer(on_tick, delay)
 
 
-def total_time() -> None:
+def total_time() -> int:
     """
     Return to write the total time at the upper status area.
 
     Will be returned every one second.
 
         e.g. Time: 2
+
+    Returns:
+        int: The delay in milliseconds before the next call, or None once the game is over.
     """
     if not g_game_state:
-        return
+        return None
     global g_total_time
 
     if g_start_game is True:
         g_total_time += 1
     update_status()
-    turtle.ontimer(total_time, 1000)
+    if g_profiler is not None:
+        update_readout()
+    return 1000
+
+
+def record(event: str) -> None:
+    """
+    Logs an input at the current game time when the game is being recorded.
+
+    Args:
+        event (str): 'start', or the name of the key that was pressed.
+    """
+    if g_recorder is not None:
+        g_recorder.record(g_loop.now_ms, event)
 
 
 def on_arrow_key_pressed(key: str) -> None:
@@ -178,6 +319,7 @@ def on_arrow_key_pressed(key: str) -> None:
     Args:
         key (str): The key that was pressed, one of 'Up', 'Down', 'Left', or 'Right'.
     """
+    record(key)
 
     global g_key_pressed, former_key_pressed, g_movement
     g_key_pressed = key
@@ -194,6 +336,7 @@ def if_paused() -> None:
     Decide the movement (move or pause) when the spaced is slicked.
 
     """
+    record(KEY_SPACE)
     global g_key_pressed, former_key_pressed, g_movement
     if g_movement == "Paused":
         g_key_pressed = former_key_pressed
@@ -204,36 +347,25 @@ def if_paused() -> None:
         update_status()
 
 
-def movable(heading: int, item: turtle.Turtle) -> bool:
+def movable(heading: int, cell: int) -> bool:
     """
     Detect whether the snake can move to the certain place and doesn't collide into the Margin.
 
      Args:
         heading (int): The direction of the turtle want to go. 0,1,2,3,
                         represent for right, up, left, down respectively.
-        item (turtle.Turtle): Item represent for the turtle of the snake's head.
-
-    """
-    # if heading is up or right, which the value of coordinate will increase, then forward is positive.
-    # if heading is down or left, which the value of coordinate will decrease, then forward is negative.
-    forward = 1.5 - heading
-    # direction is the sign of forward -1 or +1.
-    direction = int(forward / abs(forward))
-    x = int(item.pos()[0] + (heading + 1) % 2 * SZ_SQUARE * direction)
-    y = int(item.pos()[1] + heading % 2 * SZ_SQUARE * direction)
-    if -DIM_PLAY_AREA // 2 <= x <= DIM_PLAY_AREA // 2 and \
-            -DIM_PLAY_AREA // 2 - 20 <= y <= DIM_PLAY_AREA // 2 - 20:
-        return True
-    else:
-        return False
+        cell (int): The grid cell of the snake's head.
 
+    """
+    return g_grid.step(cell, *STEP_BY_HEADING[heading]) is not None
 
-def on_timer_snake() -> None:
+
+def on_timer_snake() -> int:
     """
     Advances the snake's movement on a timer. This function is called repeatedly
-    by the Turtle screen's `ontimer` method to update the snake's position.
+    by the game loop to update the snake's position.
 
-    If no key has been pressed, the function simply schedules itself to be called
+    If no key has been pressed, the function simply asks to be called
     again after the `TIMER_SNAKE` interval. Otherwise, it performs the following steps:
 
     1. Clones the snake's head as a new body segment by setting the color to `COLOR_BODY`
@@ -242,149 +374,156 @@ def on_timer_snake() -> None:
     3. Advances the snake's position by setting the heading based
         on the last key pressed (`g_key_pressed`),
         moving the snake forward by `SZ_SQUARE` units,
-        and store the snake's position in a list.
+        and push the snake's new cell onto g_snake_items.
     4. If the number of stamped segments exceeds the current snake size (`g_snake_sz`),
         removes the last segment by clearing the oldest stamp.
     5. detect whether the snake consumes food, if it consumes
         food then slow down the snake and change the snake's size.
-    6. Updates the Turtle screen to reflect the changes.
-    7. Schedules the function to be called again after the `TIMER_SNAKE` interval.
+    6. Returns the delay before the next move, `TIMER_SNAKE` or longer while digesting food.
+
+    Returns:
+        int: The delay in milliseconds before the next call, or None once the game is over.
     """
     if not g_game_state:
-        return
+        return None
     if (g_key_pressed is None) or g_movement == "Paused":
-        g_screen.ontimer(on_timer_snake, TIMER_SNAKE)
-        return
+        return TIMER_SNAKE
     heading = (HEADING_BY_KEY[g_key_pressed]) // 90
 
-    if movable(heading, g_snake):
-        # Clone the head as body
-        g_snake.color(*COLOR_BODY)
-        g_snake.stamp()
-        g_snake.color(COLOR_HEAD)
-
-        # Advance snake
-        g_snake.setheading(HEADING_BY_KEY[g_key_pressed])
-        g_snake.forward(SZ_SQUARE)
-        g_snake_items.append(g_snake.pos())
+    head = g_snake_items.head
+    if movable(heading, head):
+        if g_screen is not None:
+            # Clone the head as body
+            g_snake.color(*COLOR_BODY)
+            g_snake.stamp()
+            g_snake.color(COLOR_HEAD)
+
+            # Advance snake
+            g_snake.setheading(HEADING_BY_KEY[g_key_pressed])
+            g_snake.forward(SZ_SQUARE)
+        g_snake_items.push_head(g_grid.step(head, *STEP_BY_HEADING[heading]))
         consume_food()
         global g_food_consumption
 
         # Shifting or extending the tail.
         # Remove the last square on Shifting.
 
-        if len(g_snake.stampItems) > g_snake_sz:
-            g_snake.clearstamps(1)
-            g_snake_items.pop(0)
-    if len(g_snake.stampItems) == 20:
+        # every cell behind the head is one stamped segment
+        if len(g_snake_items) - 1 > g_snake_sz:
+            if g_screen is not None:
+                g_snake.clearstamps(1)
+            g_snake_items.pop_tail()
+    if len(g_snake_items) - 1 == 20:
         game_state("Winner !!")
 
-    g_screen.update()
     delay = 200
     if g_food_consumption > 0:
         g_food_consumption -= 1
-        g_screen.ontimer(on_timer_snake, TIMER_SNAKE + delay)
-    else:
-        g_screen.ontimer(on_timer_snake, TIMER_SNAKE)
+        return TIMER_SNAKE + delay
+    return TIMER_SNAKE
 
 
-def on_timer_monster() -> None:
+def on_timer_monster() -> int:
     """
     Advances the monster's movement on a timer.
     This function is called repeatedly
-    by the Turtle screen's `ontimer` method to update the monster's position.
+    by the game loop to update the monster's position.
 
     The function performs the following steps:
 
     1. Randomly choice the monster(s) to move.
-    2. Calculates the heading for the monster to move towards the snake,
-        snapping to the nearest 45-degree angle.
-    3. Sets the monster's heading to the calculated value.
-    4. Moves the monster forward by `SZ_SQUARE` units,
-        and detect whether the monster will contact with the snake's tail.
-    5. Updates the Turtle screen to reflect the changes.
-    6. Schedules the function to be called again after a random delay
+    2. Updates the flow field once: the breadth-first distance of every cell
+        from the snake's head, walking around the snake's body.
+    3. Moves each chosen monster to the next cell of the flow field,
+        and detect whether the monster touches the snake's tail from the cell it moved to.
+    4. Returns a random delay before the next call,
         between `TIMER_SNAKE-200` and `TIMER_SNAKE+500` milliseconds.
+
+    Returns:
+        int: The delay in milliseconds before the next call, or None once the game is over.
     """
     if not g_game_state:
-        return
-    number = random.randint(0, 3)
-    move_monster = random.sample(g_monster_items, number)
+        return None
+    number = g_rng.randint(0, 3)
+    move_monster = g_rng.sample(g_monster_items, number)
+    if move_monster:
+        g_flow.update(g_snake_items.head, g_grid.snake)
     for monster in move_monster:
-
-        angle = monster.towards(g_snake)
-        qtr = angle // 45  # (0,1,2,3,4,5,6,7)
-        heading = qtr * 45 if qtr % 2 == 0 else (qtr + 1) * 45
-        if movable(heading, monster):
-            monster.setheading(heading)
-            monster.forward(SZ_SQUARE)
-            x, y = monster.pos()
-            detect_contact(x, y)
-        g_screen.update()
-    delay = random.randint(TIMER_SNAKE - 200, TIMER_SNAKE + 500)
-    g_screen.ontimer(on_timer_monster, delay)
+        cell = g_monsters.cells[monster]
+        new_cell = g_flow.next_cell(cell)
+        if new_cell != cell:
+            g_monsters.move(monster, new_cell)
+            if g_screen is not None:
+                monster.goto(*to_xy(new_cell))
+            detect_contact(new_cell)
+    return g_rng.randint(TIMER_SNAKE - 200, TIMER_SNAKE + 500)
 
 
 def food_item() -> None:
     """
     Create certain food with the designed number.
+
+    Each food goes on a random free cell, so it never lands on the snake,
+    a monster or other food, and placing it never has to retry.
     """
     for i in range(FOOD_NUMBER):
-        x_position = -DIM_PLAY_AREA // 2 + random.randint(1, -1 + 500 // 20) * 20 + 10
-        y_position = -DIM_PLAY_AREA // 2 + random.randint(1, -1 + 500 // 20) * 20 - 20
+        cell = g_grid.free.sample(g_rng)
+        if cell is None:
+            break
+        g_food_items[cell] = [i + 1, None]
+        g_grid.add_food(cell)
+        if g_screen is None:
+            continue
+        x_position, y_position = to_xy(cell)
         g_food = turtle.Turtle('square')
         g_food.color("black")
         g_food.penup()
-        g_food.goto(x_position, y_position)
+        # the number is written from its baseline, half a square below the centre of the cell
+        g_food.goto(x_position, y_position - SZ_SQUARE // 2)
         g_food.pendown()
         g_food.write(i + 1, align="center", font=("Arial", 10, "normal"))
-        g_food_items.append([i + 1, g_food])
+        g_food_items[cell][1] = g_food
         g_food.hideturtle()
 
 
-def on_timer_food() -> None:
+def on_timer_food() -> int:
     """
     Advances the food's movement on a timer.
     This function is called repeatedly
-    by the Turtle screen's `ontimer` method to update the food's position.
+    by the game loop to update the food's position.
 
     The function performs the following steps:
 
-    1. Calculates whether the intended mover will out of scope.
-    2. Moves the food by 40 to the intended position.
-    4. Updates the Turtle screen to reflect the changes.
-    5. Schedules the function to be called again after a random delay
+    1. Randomly choice the food(s) to move.
+    2. Moves each of them by 40 to one of the free cells among its precomputed
+        moves inside the play area, or leaves it in place if none is free.
+    3. Returns a random delay before the next call,
         between `5000` and `10000` milliseconds.
-    """
-    global food
-    if len(g_food_items) == 0:
-        return
-    flag = False
-    while not flag:
-        number = random.randint(1, len(g_food_items))
-        food = random.sample(g_food_items, number)
-        count = 0
-        for single_food in food:
-            if -DIM_PLAY_AREA // 2 + 40 <= single_food[1].pos()[0] <= DIM_PLAY_AREA // 2 - 40 and \
-                    -DIM_PLAY_AREA // 2 + 20 <= single_food[1].pos()[1] <= DIM_PLAY_AREA // 2 - 80:
-                count += 1
-        if count == number:
-            flag = True
-    for single_food in food:
-        x_food, y = single_food[1].pos()
+
+    Returns:
+        int: The delay in milliseconds before the next call, or None once the food is gone or the game is over.
+    """
+    if len(g_food_items) == 0 or not g_game_state:
+        return None
+    number = g_rng.randint(1, len(g_food_items))
+    for cell in g_rng.sample(list(g_food_items), number):
+        free = [jump for jump in g_food_jumps[cell] if jump in g_grid.free]
+        if not free:
+            continue
+        new_cell = g_rng.choice(free)
+        single_food = g_food_items.pop(cell)
+        g_food_items[new_cell] = single_food
+        g_grid.remove_food(cell)
+        g_grid.add_food(new_cell)
+        if g_screen is None:
+            continue
+        x_food, y = to_xy(new_cell)
         single_food[1].clear()
-        heading = random.randint(0, 3)
-        forward = 1.5 - heading
-        direction = int(forward / abs(forward))
-        x_food = int(x_food + (heading + 1) % 2 * 40 * direction)
-        y = int(y + heading % 2 * 40 * direction)
         single_food[1].penup()
-        single_food[1].goto(x_food, y)
+        single_food[1].goto(x_food, y - SZ_SQUARE // 2)
         single_food[1].pendown()
         single_food[1].write(single_food[0], align="center", font=("Arial", 10, "normal"))
-    g_screen.update()
-    delay = random.randint(5000, 10000)
-    g_screen.ontimer(on_timer_food, delay)
+    return g_rng.randint(5000, 10000)
 
 
 def consume_food() -> bool:
@@ -400,58 +539,57 @@ def consume_food() -> bool:
 
     if not g_game_state:
         return
-    for food in g_food_items:
-        if abs(int(g_snake_items[len(g_snake_items) - 1][0] - food[1].pos()[0])) <= 2 and \
-                abs(int(g_snake_items[len(g_snake_items) - 1][1] - 10 - food[1].pos()[1])) <= 2:
+    head = g_snake_items.head
+    if g_grid.food[head]:
+        food = g_food_items.pop(head)
+        g_grid.remove_food(head)
+        if g_screen is not None:
             food[1].clear()
-            global g_snake_sz, g_food_consumption
-            g_snake_sz += food[0]
-            g_food_items.remove(food)
-            g_food_consumption += food[0]
-            update_status()
-            return True
+        global g_snake_sz, g_food_consumption
+        g_snake_sz += food[0]
+        g_food_consumption += food[0]
+        update_status()
+        return True
     return False
 
 
-def detect_contact(x: float, y: float) -> None:
+def detect_contact(cell: int) -> None:
     """
-        Detect whether the monster collides into snake's tail when the monster moves.
+        Detect whether the monster touches the snake's tail when the monster moves.
+
+        The flow field leads monsters around the snake's body rather than over
+        it, so a monster touches the tail when it moves next to a segment.
 
         Args:
-        x (float) the x coordinate of the monster.
-        y (float) the y coordinate of the monster.
+        cell (int) the grid cell the monster moved to.
 
         Modifies:
         g_contact (int): Increments the number of contact by one.
 
 
         """
-    not_contact = 0
-    for i in range(len(g_snake_items)):
-        dict_x = int(abs(g_snake_items[i][0] - x))
-        dict_y = int(abs(g_snake_items[i][1] - y))
-        global g_contact
-        if dict_y + dict_x > SZ_SQUARE - 2:
-            not_contact += 1
-    if not_contact < len(g_snake_items):
-        g_contact += 1
-        update_status()
+    global g_contact
+    snake = g_grid.snake
+    for n in g_flow.neighbours[cell]:
+        if snake[n]:
+            g_contact += 1
+            update_status()
+            return
 
 
-def on_timer_game_over_contact() -> None:
+def on_timer_game_over_contact() -> int:
     """
         Detect whether the snake collides into monster(s).
 
+        Returns:
+        int: The delay in milliseconds before the next check, or None once the game is over.
+
         """
     if not g_game_state:
-        return
-    for j in range(len(g_monster_items)):
-        x_position, y_position = g_monster_items[j].pos()
-        dict_x = int(abs(g_snake_items[len(g_snake_items) - 1][0] - x_position))
-        dict_y = int(abs(g_snake_items[len(g_snake_items) - 1][1] - y_position))
-        if dict_y + dict_x <= SZ_SQUARE - 2:
-            game_state("Game over !!")
-    g_screen.ontimer(on_timer_game_over_contact, TIMER_SNAKE // 2)
+        return None
+    if g_monsters.occupied(g_snake_items.head):
+        game_state("Game over !!")
+    return TIMER_SNAKE // 2
 
 
 def game_state(state: str) -> None:
@@ -462,12 +600,14 @@ def game_state(state: str) -> None:
     state (str): The subtitle which want to show on the screen
 
     """
-    subtitle = create_turtle(0, 0)
-    subtitle.hideturtle()
-    subtitle.pencolor('red')
-    subtitle.write(state, align="center", font=("Arial", 50, "normal"))
-    global g_game_state
+    if g_screen is not None:
+        subtitle = create_turtle(0, 0)
+        subtitle.hideturtle()
+        subtitle.pencolor('red')
+        subtitle.write(state, align="center", font=("Arial", 50, "normal"))
+    global g_game_state, g_subtitle
     g_game_state = False
+    g_subtitle = state
 
 
 def cb_start_game(x, y):
@@ -480,23 +620,125 @@ def cb_start_game(x, y):
     1. Clears the on-screen click handler to prevent further clicks from starting the game.
     2. Clears the introductory message.
     3. Registers key event handlers for the arrow keys to handle player movement.
-    4. Starts the timer-based updates for the snake, monster movements, food and detect contact with the snake's head.
+    4. Adds the snake, monster movements, food and detect contact with the snake's head to the game loop.
     """
-    g_screen.onscreenclick(None)
+    record("start")
     global g_start_game
     g_start_game = True
-    g_intro.clear()
+    if g_screen is not None:
+        g_screen.onscreenclick(None)
+        g_intro.clear()
     food_item()
     global g_movement
     g_movement = "Move"
     update_status()
-    g_screen.onkey(if_paused, KEY_SPACE)
-    for key in (KEY_UP, KEY_DOWN, KEY_RIGHT, KEY_LEFT):
-        g_screen.onkey(partial(on_arrow_key_pressed, key), key)
-    on_timer_snake()
-    on_timer_monster()
-    on_timer_food()
-    on_timer_game_over_contact()
+    if g_screen is not None:
+        g_screen.onkey(if_paused, KEY_SPACE)
+        for key in (KEY_UP, KEY_DOWN, KEY_RIGHT, KEY_LEFT):
+            g_screen.onkey(partial(on_arrow_key_pressed, key), key)
+    for subsystem in (on_timer_snake, on_timer_monster, on_timer_food, on_timer_game_over_contact):
+        g_loop.add(timed(subsystem))
+
+
+def terminal_frame() -> bytearray:
+    """
+    Returns the play area as one glyph per grid cell for the terminal renderer.
+
+    Food shows the last digit of its number, and a monster covers whatever it stands on.
+    """
+    frame = bytearray(b" " * len(g_grid))
+    for cell in g_snake_items:
+        frame[cell] = ord("o")
+    frame[g_snake_items.head] = ord("@")
+    for cell, food in g_food_items.items():
+        frame[cell] = ord("0") + food[0] % 10
+    for cell in g_monsters.cells.values():
+        frame[cell] = ord("M")
+    return frame
+
+
+def render_terminal() -> None:
+    """
+    Draws the current frame in the terminal, writing only the cells that changed.
+    """
+    status = f"{g_status_text}    {g_readout_text}" if g_readout_text else g_status_text
+    g_terminal.draw(terminal_frame(), status, g_subtitle)
+
+
+def on_terminal_key(key: str) -> bool:
+    """
+    Handles a key pressed in the terminal the way the Tk key bindings do.
+
+    The first arrow key starts the game.
+
+    Args:
+        key (str): 'Up', 'Down', 'Left', 'Right', 'space' or 'q'.
+
+    Returns:
+        bool: False once the player quits with q.
+    """
+    if key == "q":
+        return False
+    if key == KEY_SPACE:
+        if g_start_game:
+            if_paused()
+        return True
+    if not g_start_game:
+        cb_start_game(0, 0)
+    on_arrow_key_pressed(key)
+    return True
+
+
+def play_in_terminal() -> None:
+    """
+    Runs the game in the terminal until it is over, then waits for a key.
+    """
+    g_terminal.start("Snake by A  arrows: start/move  space: pause  q: quit")
+    try:
+        with KeyReader() as keys:
+            run(g_loop, timed(render_terminal, "draw"), on_terminal_key, keys)
+            render_terminal()
+            while not g_game_state and not keys.read(1):
+                pass
+    finally:
+        g_terminal.close()
+
+
+def apply_event(event: str) -> None:
+    """
+    Replays one logged input through the same handler the player's input went through.
+    """
+    if event == "start":
+        cb_start_game(0, 0)
+    elif event == KEY_SPACE:
+        if_paused()
+    else:
+        on_arrow_key_pressed(event)
+
+
+def parse_seed(text: str) -> int:
+    """
+    Parses --seed, which a recording stores as an unsigned 64-bit number.
+    """
+    seed = int(text)
+    if not 0 <= seed < 1 << 64:
+        raise argparse.ArgumentTypeError(f"the seed must be from 0 to 2**64 - 1, got {seed}")
+    return seed
+
+
+def replay_game(events: list) -> None:
+    """
+    Re-runs a recorded game headless, as fast as the CPU allows, and prints how it ended.
+
+    Args:
+        events (list): The (time_ms, event) records of the log.
+    """
+    start = time.perf_counter()
+    ticks = replay(g_loop, events, apply_event)
+    elapsed = time.perf_counter() - start
+    print(f"{ticks} ticks ({g_loop.now_ms / 1000:.1f}s of play) in {elapsed:.3f}s, "
+          f"{ticks / max(elapsed, 1e-9):,.0f} ticks/s")
+    print(f"{g_subtitle or 'Unfinished'}    Contact-{g_contact}    Time-{g_total_time}    Length-{len(g_snake_items)}")
 
 
 if __name__ == "__main__":
@@ -507,19 +749,66 @@ if __name__ == "__main__":
     3. detect click motion.
 
     """
-    g_screen = configure_screen()
-    g_intro, g_status = configure_play_area()
+    parser = argparse.ArgumentParser(description="Snake game.")
+    parser.add_argument("--terminal", action="store_true",
+                        help="draw the game with ANSI escapes in this terminal instead of a Tk window")
+    parser.add_argument("--seed", type=parse_seed, help="seed of the game's random choices, random by default")
+    parser.add_argument("--record", metavar="FILE", help="write the seed and every input to FILE")
+    parser.add_argument("--replay", metavar="FILE", help="re-run the game recorded in FILE headless, at full speed")
+    parser.add_argument("--profile", action="store_true",
+                        help="show an fps and latency readout, and print the latency and jitter of every timer at exit")
+    parser.add_argument("--trace", metavar="FILE", help="profile, and write every timer call to FILE as a Chrome trace")
+    args = parser.parse_args()
+    if args.profile or args.trace:
+        g_profiler = Profiler(trace=args.trace is not None)
+    seed = random.randrange(2 ** 63) if args.seed is None else args.seed
+    if args.replay:
+        with open(args.replay, "rb") as log:
+            seed, events = read_log(log)
+    g_rng.seed(seed)
+    if args.record:
+        g_recorder = Recorder(open(args.record, "wb"), seed)
+    if args.terminal:
+        g_terminal = TerminalRenderer(GRID_SIZE, GRID_SIZE, GLYPH_STYLES)
+    elif not args.replay:
+        g_screen = configure_screen()
+        g_intro, g_status, g_readout = configure_play_area()
+    g_grid = OccupancyGrid(GRID_SIZE, GRID_SIZE)
+    g_flow = FlowField(g_grid)
+    g_food_jumps = g_grid.jumps(2)
+    g_monsters = SpatialHash(g_grid)
     update_status()
-    for i in range(4):
-        x = random.choice([1, -1]) * random.randint(6, 9) * 20
-        y = random.choice([1, -1]) * random.randint(6, 9) * 20 - 30
-
-        g_monster = create_turtle(x, y, COLOR_MONSTER, "black")
+    # 6 or more cells away from the centre along both axes, 3 or more from the border,
+    # as far as the play area allows; never on the centre, where the snake starts
+    farthest = max(GRID_SIZE // 2 - 3, 1)
+    closest = min(6, farthest)
+    for i in range(MONSTER_NUMBER):
+        col = GRID_SIZE // 2 + g_rng.choice([1, -1]) * g_rng.randint(closest, farthest)
+        row = GRID_SIZE // 2 + g_rng.choice([1, -1]) * g_rng.randint(closest, farthest)
+
+        g_monster = create_turtle(*to_xy(g_grid.index(col, row)), COLOR_MONSTER, "black") if g_screen is not None else i
         g_monster_items.append(g_monster)
-    g_snake = create_turtle(0, 0, COLOR_HEAD, "black")
-    g_snake_items.append(g_snake.pos())
-    total_time()
-    g_screen.onscreenclick(cb_start_game)  # set up a mouse-click call back
-    g_screen.update()
-    g_screen.listen()
-    g_screen.mainloop()
+        g_monsters.insert(g_monster, g_grid.index(col, row))
+    g_snake_items = SnakeBody(g_grid, to_cell(0, 0))
+    g_loop = GameLoop(TIMER_TICK)
+    g_loop.add(timed(total_time))
+    if args.replay:
+        replay_game(events)
+    elif g_terminal is not None:
+        play_in_terminal()
+    else:
+        g_snake = create_turtle(0, 0, COLOR_HEAD, "black")
+        g_draw = timed(g_screen.update, "draw")
+        g_frame = timed(on_frame, "frame")
+        on_tick()
+        g_screen.onscreenclick(cb_start_game)  # set up a mouse-click call back
+        g_screen.update()
+        g_screen.listen()
+        g_screen.mainloop()
+    if g_recorder is not None:
+        g_recorder.close(g_loop.now_ms)
+    if g_profiler is not None:
+        print(g_profiler.report())
+        if args.trace:
+            with open(args.trace, "w", encoding="utf-8") as trace:
+                g_profiler.write_trace(trace)
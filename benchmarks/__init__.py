@@ -0,0 +1,3 @@
+"""
+Benchmarks of the puzzle and snake games, run with python -m benchmarks from the repository root.
+"""
@@ -0,0 +1,46 @@
+"""
+Run the benchmarks and compare them with the saved baseline.
+
+    python -m benchmarks                  # run everything, fail on a regression
+    python -m benchmarks -k snake.        # only the cases whose name contains "snake."
+    python -m benchmarks --save           # record this run as the new baseline
+
+The exit status is 1 when any case is slower than its baseline by more than
+the threshold.
+"""
+import argparse
+import os
+import sys
+
+from benchmarks import puzzle, snake
+from benchmarks.harness import format_time, load_baseline, regressions, run, save_baseline
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmarks of the three games.")
+    parser.add_argument("-k", dest="pattern", default="", help="only run the cases whose name contains PATTERN")
+    parser.add_argument("--baseline", default=BASELINE, help="the baseline JSON file (default: %(default)s)")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="the slowdown over the baseline that counts as a regression (default: %(default)s)")
+    parser.add_argument("--save", action="store_true", help="save the results as the baseline")
+    args = parser.parse_args()
+
+    results = run(puzzle.CASES + snake.CASES, args.pattern)
+    if args.save:
+        save_baseline(args.baseline, results)
+        print(f"saved {len(results)} results to {args.baseline}")
+        return 0
+    baseline = load_baseline(args.baseline)
+    slower = regressions(results, baseline, args.threshold)
+    for name, ratio in slower:
+        print(f"REGRESSION {name}: {format_time(results[name])}, {ratio:.2f}x the baseline {format_time(baseline[name])}")
+    missing = [name for name in results if name not in baseline]
+    if missing:
+        print(f"{len(missing)} case(s) have no baseline yet, run with --save to record them")
+    return 1 if slower else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""
+Timing, baseline storage and regression checks shared by the benchmark modules.
+"""
+import importlib.util
+import json
+import os
+import timeit
+from typing import Callable, Dict, Iterable, List, Tuple
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+
+# a case is a name and a function that builds the callable to time, so setup stays out of the measurement
+Case = Tuple[str, Callable[[], Callable[[], object]]]
+
+
+def load_script(name: str, path: str):
+    """
+    Import one of the assignment scripts as a module without running its __main__ block.
+    """
+    spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, path))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def measure(func: Callable[[], object], repeat: int = 5, min_time: float = 0.1) -> float:
+    """
+    Return the best time of one call in seconds.
+
+    The number of calls per sample is picked so that a sample takes at least
+    min_time, and the fastest of repeat samples is kept, as it is the one
+    least disturbed by the rest of the machine.
+    """
+    timer = timeit.Timer(func)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time:
+            break
+        number *= 2 if elapsed * 10 > min_time else 10
+    best = elapsed
+    for _ in range(repeat - 1):
+        best = min(best, timer.timeit(number))
+    return best / number
+
+
+def run(cases: Iterable[Case], pattern: str = "", report: Callable[[str], None] = print) -> Dict[str, float]:
+    """
+    Time every case whose name contains pattern.
+
+    Returns:
+        dict: Seconds per call of each case.
+    """
+    results = {}
+    for name, setup in cases:
+        if pattern not in name:
+            continue
+        results[name] = seconds = measure(setup())
+        report(f"{name:<48} {format_time(seconds):>10}")
+    return results
+
+
+def format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.1f} ns"
+
+
+def load_baseline(path: str) -> Dict[str, float]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(path: str, results: Dict[str, float]) -> None:
+    """
+    Merge results into the baseline file, keeping the cases that were not run.
+    """
+    baseline = load_baseline(path)
+    baseline.update(results)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(dict(sorted(baseline.items())), f, indent=2)
+        f.write("\n")
+
+
+def regressions(results: Dict[str, float], baseline: Dict[str, float], threshold: float) -> List[Tuple[str, float]]:
+    """
+    Return the cases that got slower than their baseline by more than threshold.
+
+    Args:
+        results (dict): Seconds per call of this run.
+        baseline (dict): Seconds per call of the saved baseline.
+        threshold (float): The allowed slowdown, 0.25 for 25 %.
+
+    Returns:
+        list: (name, ratio) of every regressed case, ratio being the new time over the old.
+    """
+    slower = []
+    for name, seconds in results.items():
+        if name in baseline and seconds > baseline[name] * (1 + threshold):
+            slower.append((name, seconds / baseline[name]))
+    return slower
@@ -0,0 +1,176 @@
+"""
+Benchmarks of the sliding puzzle's hot paths, from 3x3 to boards much larger than the games use.
+"""
+import functools
+import itertools
+import random
+import time
+import turtle
+import types
+from collections import deque
+
+from puzzle_core import bitboard
+from puzzle_core.board import MeteredBoard, PuzzleBoard
+from puzzle_core.difficulty import generate_by_difficulty, layer_table
+from puzzle_core.generator import generate_new_puzzle, is_solvable, is_solved
+from puzzle_core.oracle import open_oracle
+from puzzle_core.solver import neighbour_table
+
+from benchmarks.harness import load_script
+
+SIZES = (3, 4, 5, 8, 16)
+LARGE_SIZES = (100, 1000)  # shuffled with NumPy
+
+
+def _boards(n: int, count: int = 64) -> list:
+    rng = random.Random(n)
+    return [generate_new_puzzle(n, rng) for _ in range(count)]
+
+
+def _is_solvable(n: int):
+    boards = _boards(n)
+    return lambda: [is_solvable(board, n) for board in boards]
+
+
+def _generate(n: int):
+    rng = random.Random(0)
+    return lambda: generate_new_puzzle(n, rng)
+
+
+def _generate_by_difficulty(low: int, high: int):
+    layer_table()  # built once per process, keep it out of the measurement
+    rng = random.Random(0)
+    return lambda: generate_by_difficulty(3, low, high, rng)
+
+
+def _is_solved(n: int):
+    # a solved board is the worst case, every cell gets compared
+    board = [*range(1, n * n), 0]
+    return lambda: is_solved(board)
+
+
+def _board_is_solved(n: int):
+    board = PuzzleBoard(n)
+    return board.is_solved
+
+
+def _moves(n: int, count: int = 1000) -> list:
+    """
+    A random walk of the empty square from the solved position.
+    """
+    rng = random.Random(n)
+    table = neighbour_table(n)
+    empty, walk = n * n - 1, []
+    for _ in range(count):
+        empty = rng.choice(table[empty])
+        walk.append(empty)
+    return walk
+
+
+def _move_empty(n: int, board_type: type = PuzzleBoard):
+    walk = _moves(n)
+
+    def play() -> None:
+        board = board_type(n)
+        board.apply(walk)
+    return play
+
+
+def _slide(n: int):
+    walk = _moves(n)
+    table = bitboard.move_table(n)
+    shifts = []
+    empty = n * n - 1
+    for target in walk:
+        shifts.append(next((t_shift, b_shift) for t, t_shift, b_shift in table[empty] if t == target))
+        empty = target
+
+    def play() -> None:
+        state = bitboard.goal(n)
+        for target_shift, blank_shift in shifts:
+            state = bitboard.slide(state, target_shift, blank_shift)
+    return play
+
+
+def _oracle(query: str):
+    oracle = open_oracle()  # opening it is part of startup, not of a query
+    boards = _boards(3)
+    method = getattr(oracle, query)
+    return lambda: [method(board) for board in boards]
+
+
+def _check_win():
+    game = load_script("puzzle_text_game", "assignment1/(1)A1_SSE_123090043.py")
+    states = [bitboard.encode(board) for board in _boards(3)] + [bitboard.goal(3)]
+    return lambda: [game.check_win(state) for state in states]
+
+
+class _StubCanvas:
+    """
+    Stands in for the Tk canvas behind a turtle screen, so a frame costs the turtle bookkeeping and no drawing.
+    """
+    _ids = itertools.count(1)
+
+    def cget(self, option: str):
+        return 0 if option in ("width", "height") else "white"
+
+    def bbox(self, item: int) -> tuple:
+        return 0, 0, 0, 0
+
+    def __getattr__(self, name: str):
+        def call(*args, **kwargs):
+            if name.startswith("create"):
+                return next(self._ids)
+            return 0 if name in ("winfo_width", "winfo_height") else ""
+        return call
+
+
+class _StubScreen(turtle.TurtleScreen):
+    def _blankimage(self) -> None:
+        return None  # a Tk photo image needs a real Tk interpreter
+
+
+def _gui_move(n: int):
+    """
+    One click in the GUI game, from the queued click to the end of its frame, as apply_clicks() draws it.
+    """
+    game = load_script("puzzle_gui_game", "assignment2/A2_SSE_123090043.py")
+    screen = _StubScreen(_StubCanvas())
+    # the game's own turtle module would open a Tk window, give it turtles on the stub screen instead
+    game.turtle = types.SimpleNamespace(Turtle=functools.partial(turtle.RawTurtle, screen), Shape=turtle.Shape)
+    game.screen, game.len_board = screen, n
+    game.tile_positions, game.registered_shapes = [], set()
+    game.frame_times, game.click_queue, game.drain_pending = [], deque(), False
+    game.board = MeteredBoard(n, generate_new_puzzle(n, random.Random(n)))
+    game.scale = min(1.0, game.BOARD_SPAN / (n * (game.TILE_SIZE + game.TILE_SPACE)))
+    game.x_origin = -(n - 1) * (game.TILE_SIZE + game.TILE_SPACE) * game.scale / 2
+    game.y_origin = -game.x_origin
+    screen.tracer(0)
+    game.tiles = game.display_tiles()
+    game.meter = game.create_meter()
+    rng = random.Random(0)
+    table = neighbour_table(n)
+
+    def click() -> None:
+        x, y = game.tile_positions[rng.choice(table[game.board.empty])]
+        game.click_queue.append((time.perf_counter(), x, y))
+        game.apply_clicks()
+        game.frame_times.clear()
+    return click
+
+
+CASES = [
+    *((f"puzzle.is_solvable[{n}x{n}] x64", lambda n=n: _is_solvable(n)) for n in SIZES),
+    *((f"puzzle.generate_new_puzzle[{n}x{n}]", lambda n=n: _generate(n)) for n in SIZES + LARGE_SIZES),
+    *((f"puzzle.generate_by_difficulty[3x3, {low}-{high} moves]",
+       lambda low=low, high=high: _generate_by_difficulty(low, high)) for low, high in ((5, 5), (20, 22), (31, 31))),
+    *((f"puzzle.is_solved[{n}x{n}]", lambda n=n: _is_solved(n)) for n in SIZES),
+    *((f"puzzle.PuzzleBoard.is_solved[{n}x{n}]", lambda n=n: _board_is_solved(n)) for n in SIZES),
+    *((f"puzzle.PuzzleBoard.move_empty[{n}x{n}] x1000", lambda n=n: _move_empty(n)) for n in SIZES),
+    *((f"puzzle.MeteredBoard.move_empty[{n}x{n}] x1000", lambda n=n: _move_empty(n, MeteredBoard)) for n in SIZES),
+    *((f"puzzle.bitboard.slide[{n}x{n}] x1000", lambda n=n: _slide(n)) for n in (3, 4)),
+    *((f"puzzle.oracle.{query}[3x3] x64", lambda query=query: _oracle(query)) for query in ("distance", "next_move")),
+    ("puzzle.oracle.open_oracle[3x3]", lambda: open_oracle),
+    ("puzzle.check_win[3x3] x65", _check_win),
+    ("puzzle.gui.apply_clicks[5x5] stub canvas", lambda: _gui_move(5)),
+]
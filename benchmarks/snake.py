@@ -0,0 +1,146 @@
+"""
+Benchmarks of the snake game's hot paths, run on the game's own functions with no window.
+"""
+import contextlib
+import io
+import os
+import random
+import runpy
+import sys
+import tempfile
+
+import numpy as np
+
+from snake_core.flow import FlowField
+from snake_core.grid import OccupancyGrid, SnakeBody
+from snake_core.replay import Recorder
+from snake_core.spatial import SpatialHash
+from snake_core.vector import VectorSnake
+
+from benchmarks.harness import ROOT, load_script
+
+GAME = "assignment3/A3_SSE_123090043.py"
+SIDE = 64  # wide enough for a snake of thousands of cells
+LENGTHS = (10, 100, 1000, 4000)
+MONSTERS = (4, 32, 256, 1024)
+
+
+def _game():
+    """
+    The game module with an empty SIDE x SIDE board, the way __main__ would set it up headless.
+    """
+    game = load_script("snake_game", GAME)
+    game.g_grid = OccupancyGrid(SIDE, SIDE)
+    game.g_flow = FlowField(game.g_grid)
+    game.g_monsters = SpatialHash(game.g_grid)
+    game.g_rng = random.Random(0)
+    return game
+
+
+def _snake(game, length: int) -> None:
+    """
+    Lay a snake of length cells along the rows, back and forth, ending at its head.
+    """
+    cells = []
+    for row in range(SIDE):
+        cols = range(SIDE) if row % 2 == 0 else range(SIDE - 1, -1, -1)
+        cells.extend(game.g_grid.index(col, row) for col in cols)
+    game.g_snake_items = SnakeBody(game.g_grid, cells[0])
+    for cell in cells[1:length]:
+        game.g_snake_items.push_head(cell)
+
+
+def _detect_contact(length: int):
+    game = _game()
+    _snake(game, length)
+    on_body, off_body = game.g_snake_items.head, SIDE * SIDE - 1
+    return lambda: (game.detect_contact(on_body), game.detect_contact(off_body))
+
+
+def _consume_food(length: int):
+    game = _game()
+    _snake(game, length)
+    head = game.g_snake_items.head
+
+    def eat() -> None:
+        game.g_food_items[head] = [1, None]
+        game.g_grid.add_food(head)
+        game.consume_food()
+        game.consume_food()  # and a step with nothing to eat
+    return eat
+
+
+def _on_timer_monster(count: int):
+    game = _game()
+    _snake(game, 50)
+    rng = random.Random(count)
+    game.g_monster_items = list(range(count))
+    for monster in game.g_monster_items:
+        game.g_monsters.insert(monster, rng.randrange(SIDE * SIDE))
+    return game.on_timer_monster
+
+
+def _all_monsters_step(count: int):
+    """
+    One flow-field update followed by a step of every monster, the cost of a tick in which all of them move.
+    """
+    grid = OccupancyGrid(SIDE, SIDE)
+    body = SnakeBody(grid, grid.index(SIDE // 2, SIDE // 2))
+    flow = FlowField(grid)
+    monsters = SpatialHash(grid)
+    rng = random.Random(count)
+    for monster in range(count):
+        monsters.insert(monster, rng.randrange(SIDE * SIDE))
+
+    def tick() -> None:
+        flow.update(body.head, grid.snake)
+        for monster, cell in list(monsters.cells.items()):
+            monsters.move(monster, flow.next_cell(cell))
+    return tick
+
+
+def _record(path: str, seconds: int) -> None:
+    recorder = Recorder(open(path, "wb"), seed=1)
+    recorder.record(0, "start")
+    # circle around the centre so the snake stays on the board
+    for i, time_ms in enumerate(range(0, seconds * 1000, 800)):
+        recorder.record(time_ms, ("Right", "Up", "Left", "Down")[i % 4])
+    recorder.close(seconds * 1000)
+
+
+def _replay(seconds: int):
+    """
+    A recorded game of the given length replayed headless through the game's --replay mode.
+
+    The harness has no teardown, so every call writes the log to its own
+    temporary directory and removes it again, which is noise next to the replay.
+    """
+    def play() -> None:
+        saved = sys.argv
+        with tempfile.TemporaryDirectory() as directory:
+            log = os.path.join(directory, "game.snk")
+            _record(log, seconds)
+            sys.argv = [GAME, "--replay", log]
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    runpy.run_path(os.path.join(ROOT, GAME), run_name="__main__")
+            finally:
+                sys.argv = saved
+    return play
+
+
+def _vector_step(count: int):
+    env = VectorSnake(count, seed=0)
+    actions = np.random.default_rng(0).integers(0, 4, (64, count))
+    steps = iter(range(1 << 62))
+    return lambda: env.step(actions[next(steps) % 64])
+
+
+CASES = [
+    *((f"snake.detect_contact[length {n}] x2", lambda n=n: _detect_contact(n)) for n in LENGTHS),
+    *((f"snake.consume_food[length {n}] x2", lambda n=n: _consume_food(n)) for n in LENGTHS),
+    *((f"snake.on_timer_monster[{n} monsters]", lambda n=n: _on_timer_monster(n)) for n in MONSTERS),
+    *((f"snake.all_monsters_step[{n} monsters]", lambda n=n: _all_monsters_step(n)) for n in MONSTERS),
+    ("snake.replay[60s of play]", lambda: _replay(60)),
+    *((f"snake.VectorSnake.step[{n} games]", lambda n=n: _vector_step(n)) for n in (1, 256, 4096)),
+]
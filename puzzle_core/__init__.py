@@ -0,0 +1,8 @@
+"""
+Headless engine for Kinley's sliding puzzle.
+
+The text game (assignment1) and the GUI game (assignment2) both draw boards that
+are stored as flat row-major lists with 0 for the empty square. Everything in
+this package works on that layout and never imports turtle, so it can be used by
+solvers, simulations and benchmarks as well as by the games themselves.
+"""
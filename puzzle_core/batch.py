@@ -0,0 +1,142 @@
+"""
+Vectorised generation of many boards at once with NumPy.
+
+Every board is a row of an (N, n*n) uint8 array laid out like the flat puzzle
+list of the games, so a row can be handed straight to PuzzleBoard or a solver.
+Boards of both games are covered: the text game is the n = 3 case.
+"""
+from typing import Optional
+
+import numpy as np
+
+from puzzle_core.solver import goal_state
+
+
+def batch_parity(boards: np.ndarray) -> np.ndarray:
+    """
+    Return the inversion parity of every row, counting the empty square as 0.
+
+    Args:
+        boards (np.ndarray): An (N, m) array, each row a permutation of 0 .. m-1.
+
+    Returns:
+        np.ndarray: An (N,) uint8 array of 0 for even and 1 for odd.
+    """
+    parity = np.zeros(len(boards), dtype=np.uint8)
+    for i in range(boards.shape[1] - 1):
+        parity ^= (np.count_nonzero(boards[:, i:i + 1] > boards[:, i + 1:], axis=1) & 1).astype(np.uint8)
+    return parity
+
+
+def shuffled_board(size: int, seed: Optional[int] = None) -> tuple:
+    """
+    Return a uniformly random permutation of 0 .. size-1 as a list, with its parity.
+
+    A random arrangement is cut into cycles before each of its left-to-right
+    maxima. By Foata's correspondence every permutation comes from exactly
+    one arrangement, so the result is uniform, and the number of cycles, and
+    with it the parity, is one running maximum instead of a walk of every cycle.
+
+    Returns:
+        tuple: The permutation as a list, and 0 if it is even or 1 if it is odd.
+    """
+    order = np.random.default_rng(seed).permutation(size)
+    starts = np.flatnonzero(order == np.maximum.accumulate(order))
+    following = np.roll(order, -1)
+    # the last element of every cycle goes back to its first
+    following[np.append(starts[1:], size) - 1] = order[starts]
+    board = np.empty(size, dtype=np.intp)
+    board[order] = following
+    return board.tolist(), (size - len(starts)) & 1
+
+
+def batch_is_solvable(boards: np.ndarray, n: int) -> np.ndarray:
+    """
+    Return a boolean mask of the solvable rows, using the same rule as generator.is_solvable.
+    """
+    empty = np.argmax(boards == 0, axis=1)
+    parity = batch_parity(boards) ^ (empty & 1).astype(np.uint8)
+    if n % 2 == 0:
+        parity ^= ((n - 1 - empty // n) & 1).astype(np.uint8)
+    return parity == 0
+
+
+def generate_batch(count: int, n: int, seed: Optional[int] = None) -> np.ndarray:
+    """
+    Generate solvable, unsolved boards in bulk without rejection sampling.
+
+    Rows are shuffled independently. The unsolvable half is repaired by
+    swapping the first two tiles that are not the empty square, and any row
+    that came out solved has its last tile slid into the corner.
+
+    Args:
+        count (int): The number of boards N.
+        n (int): The board width, at most 16 so tiles fit a byte.
+        seed (int, optional): The seed of the NumPy generator.
+
+    Returns:
+        np.ndarray: An (N, n*n) uint8 array.
+    """
+    if not 2 <= n <= 16:
+        raise ValueError("batch boards are uint8, so the width must be from 2 to 16")
+    size = n * n
+    rng = np.random.default_rng(seed)
+    boards = rng.permuted(np.broadcast_to(np.arange(size, dtype=np.uint8), (count, size)), axis=1)
+    rows = np.flatnonzero(~batch_is_solvable(boards, n))
+    # the first two cells that do not hold the empty square
+    first = (boards[rows, 0] == 0).astype(np.intp)
+    second = np.where(boards[rows, 1] == 0, 2, first + 1)
+    boards[rows, first], boards[rows, second] = boards[rows, second], boards[rows, first]
+    rows = np.flatnonzero((boards == np.array(goal_state(n), dtype=np.uint8)).all(axis=1))
+    boards[rows, size - 1], boards[rows, size - 2] = boards[rows, size - 2], 0
+    return boards
+
+
+def manhattan_distances(boards: np.ndarray, n: int) -> np.ndarray:
+    """
+    Return the Manhattan distance of every row, the empty square excluded.
+    """
+    size = n * n
+    goal = np.arange(-1, size - 1)
+    goal[0] = size - 1
+    cells = np.arange(size)
+    table = np.abs(goal[:, None] // n - cells // n) + np.abs(goal[:, None] % n - cells % n)
+    table[0] = 0
+    return table[boards, cells].sum(axis=1)
+
+
+def manhattan_summary(boards: np.ndarray, n: int) -> dict:
+    """
+    Summarise the Manhattan distances of a batch.
+
+    Returns:
+        dict: count, mean, std, min, max, the 5th/25th/50th/75th/95th
+        percentiles, and a histogram mapping each distance to its number of boards.
+    """
+    distances = manhattan_distances(boards, n)
+    percentiles = np.percentile(distances, [5, 25, 50, 75, 95])
+    counts = np.bincount(distances)
+    return {
+        "count": int(distances.size),
+        "mean": float(distances.mean()),
+        "std": float(distances.std()),
+        "min": int(distances.min()),
+        "max": int(distances.max()),
+        "percentiles": {p: float(v) for p, v in zip((5, 25, 50, 75, 95), percentiles)},
+        "histogram": {d: int(c) for d, c in enumerate(counts) if c},
+    }
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    width = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    total = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000
+    start = time.perf_counter()
+    batch = generate_batch(total, width, seed=0)
+    elapsed = time.perf_counter() - start
+    summary = manhattan_summary(batch, width)
+    print(f"{total} boards of {width}x{width} in {elapsed:.2f}s ({total / elapsed:,.0f} boards/s)")
+    print(f"Manhattan distance: mean {summary['mean']:.2f}, std {summary['std']:.2f}, "
+          f"range {summary['min']}-{summary['max']}, median {summary['percentiles'][50]:.0f}")
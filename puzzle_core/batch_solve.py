@@ -0,0 +1,161 @@
+"""
+Solve a file of boards across a process pool, optimally up to 4x4.
+
+    python -m puzzle_core.batch_solve boards.txt > solutions.jsonl
+
+Every line of the input is one flat board, as a JSON list like the games'
+puzzle lists or as plain numbers separated by commas or spaces. Every board
+becomes one JSON line on stdout as soon as it is solved:
+
+    {"line": 3, "board": [...], "moves": [...], "length": 22, "optimal": true, "nodes": 1534, "seconds": 0.0121}
+
+An optimal 5x5 search can run for hours, so 5x5 and wider boards go through
+solve_bounded, which trades a few extra moves for a fixed node budget per
+attempt, and their records say "optimal": false. Records carry "error" instead of the moves when the board cannot be solved. The
+lines come out in the order the boards finish; "line" is the board's line
+number in the input. Throughput and latency percentiles go to stderr.
+
+The pattern databases of the widths in the file are built once, saved under
+--tables and memory-mapped by every worker, so the pool shares one copy of
+them instead of building or pickling one per process.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from typing import Iterator, List, Optional, Tuple
+
+from puzzle_core.generator import board_width
+from puzzle_core.pdb import CACHE, PARTITIONS, cached_database, search, solve_bounded
+
+PERCENTILES = (50, 90, 99)
+BOUNDED_WIDTH = 5  # boards this wide and wider are solved within a node budget, not optimally
+BOUNDED_NODES = 2_000_000  # the budget of one bounded attempt unless --max-nodes is given
+
+_tables = None  # the workers' table directory
+_databases = {}  # the workers' mapped databases by width
+_max_nodes = None
+
+
+def parse_board(text: str) -> list:
+    """
+    Parse one board written as a JSON list, or as numbers separated by commas or spaces.
+    """
+    text = text.strip()
+    if not text.startswith("["):
+        return [int(tile) for tile in text.replace(",", " ").split()]
+    tiles = json.loads(text)
+    # int() would let null and nested lists through as TypeError and cut 4.5 down to 4
+    for tile in tiles:
+        if not isinstance(tile, int) or isinstance(tile, bool):
+            raise ValueError(f"a board holds whole numbers only, got {json.dumps(tile)}")
+    return tiles
+
+
+def read_boards(lines) -> Iterator[Tuple[int, str]]:
+    """
+    Yield (line number, text) for every line holding a board, skipping blanks and # comments.
+    """
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if line and not line.startswith("#"):
+            yield number, line
+
+
+def _start_worker(tables: str, max_nodes: Optional[int]) -> None:
+    global _tables, _max_nodes
+    _tables, _max_nodes = tables, max_nodes
+
+
+def solve_line(job: Tuple[int, str]) -> dict:
+    """
+    Solve the board of one input line in a worker and return its JSON record.
+    """
+    number, text = job
+    record = {"line": number}
+    start = time.perf_counter()
+    try:
+        board = parse_board(text)
+        record["board"] = board
+        n = board_width(board)
+        if sorted(board) != list(range(n * n)):
+            raise ValueError(f"the board must hold each of 0 to {n * n - 1} once")
+        if n not in PARTITIONS:
+            raise ValueError(f"no pattern database for {n}x{n} boards")
+        if n not in _databases:
+            _databases[n] = cached_database(n, _tables)
+        optimal = n < BOUNDED_WIDTH
+        if optimal:
+            result = search(board, _databases[n], max_nodes=_max_nodes)
+        else:
+            result = solve_bounded(board, _databases[n], max_nodes=_max_nodes or BOUNDED_NODES)
+    except (ValueError, RuntimeError) as error:
+        record["error"] = str(error)
+    else:
+        record.update(moves=result.moves, length=len(result.moves), optimal=optimal, nodes=result.nodes)
+    record["seconds"] = round(time.perf_counter() - start, 6)
+    return record
+
+
+def percentile(ordered: List[float], p: float) -> float:
+    """
+    Return the nearest-rank p-th percentile of an ascending list.
+    """
+    return ordered[max(0, -(-len(ordered) * p // 100) - 1)]
+
+
+def report(latencies: List[float], failed: int, elapsed: float) -> str:
+    """
+    Return the summary line of a run: boards, failures, throughput and latency percentiles in milliseconds.
+    """
+    ordered = sorted(latencies)
+    summary = (f"{len(ordered)} boards, {failed} failed, in {elapsed:.2f}s "
+               f"({len(ordered) / max(elapsed, 1e-9):,.1f} boards/s)")
+    if ordered:
+        summary += ", latency " + " ".join(f"p{p} {1000 * percentile(ordered, p):.1f}ms" for p in PERCENTILES)
+        summary += f" max {1000 * ordered[-1]:.1f}ms"
+    return summary
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m puzzle_core.batch_solve",
+                                     description="Solve boards across a process pool, optimally up to 4x4.")
+    parser.add_argument("boards", nargs="?", default="-", help="a file with one board per line ('-' for stdin)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="processes (default: %(default)s)")
+    parser.add_argument("--tables", default=CACHE, help="where the pattern databases are kept (default: %(default)s)")
+    parser.add_argument("--max-nodes", type=int, help="give up on a board up to 4x4 after this many expansions, "
+                             f"and retry wider ones more greedily (default for those: {BOUNDED_NODES:,})")
+    args = parser.parse_args()
+
+    if args.boards == "-":
+        jobs = list(read_boards(sys.stdin))
+    else:
+        with open(args.boards, encoding="utf-8") as boards:
+            jobs = list(read_boards(boards))
+    widths = set()
+    for _, text in jobs:
+        try:
+            widths.add(board_width(parse_board(text)))
+        except ValueError:
+            pass  # reported by the worker
+    # build the missing tables once, here, before the workers map them
+    for n in sorted(widths.intersection(PARTITIONS)):
+        start = time.perf_counter()
+        cached_database(n, args.tables)
+        print(f"{n}x{n} tables ready in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+
+    latencies, failed = [], 0
+    start = time.perf_counter()
+    with multiprocessing.Pool(args.workers, _start_worker, (args.tables, args.max_nodes)) as pool:
+        for record in pool.imap_unordered(solve_line, jobs):
+            print(json.dumps(record), flush=True)
+            latencies.append(record["seconds"])
+            failed += "error" in record
+    print(report(latencies, failed, time.perf_counter() - start), file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
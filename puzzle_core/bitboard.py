@@ -0,0 +1,131 @@
+"""
+Boards packed into a single int, 4 bits per cell.
+
+Cell i of a flat board lives in bits 4*i .. 4*i+3, so a 3x3 board takes 36 bits
+and a 4x4 board 64 bits. Python ints hash and compare as one value, which makes
+them much cheaper dictionary keys and solved checks than lists or tuples, and a
+move is a shift, a mask and two additions taken from a precomputed table.
+"""
+from collections import deque
+from typing import Iterator, Sequence, Tuple
+
+from puzzle_core.generator import generate_new_puzzle, is_solvable
+from puzzle_core.solver import neighbour_table
+
+BITS = 4
+MASK = (1 << BITS) - 1
+MAX_WIDTH = 4
+
+
+def encode(puzzle: Sequence[int]) -> int:
+    """
+    Pack a flat board of at most 16 cells into an int.
+    """
+    if len(puzzle) > 1 << BITS:
+        raise ValueError(f"a bitboard holds at most {1 << BITS} cells")
+    state = 0
+    for i, tile in enumerate(puzzle):
+        state |= tile << (BITS * i)
+    return state
+
+
+def decode(state: int, n: int) -> list:
+    """
+    Unpack an int into a flat board of width n.
+    """
+    return [(state >> (BITS * i)) & MASK for i in range(n * n)]
+
+
+GOALS = {n: encode([*range(1, n * n), 0]) for n in range(2, MAX_WIDTH + 1)}
+
+
+def goal(n: int) -> int:
+    """
+    Return the solved board of width n as an int.
+    """
+    return GOALS[n]
+
+
+def blank_index(state: int, n: int) -> int:
+    """
+    Return the index of the empty square.
+    """
+    for i in range(n * n):
+        if not (state >> (BITS * i)) & MASK:
+            return i
+    raise ValueError("the board has no empty square")
+
+
+_TABLES = {}
+
+
+def move_table(n: int) -> tuple:
+    """
+    Return the legal moves of every empty-square position.
+
+    Entry blank holds one (target, target_shift, blank_shift) triple per legal
+    move, target being the index the empty square moves to and the shifts the
+    bit offsets of the two cells.
+    """
+    if n not in _TABLES:
+        if not 2 <= n <= MAX_WIDTH:
+            raise ValueError(f"bitboards cover widths 2 to {MAX_WIDTH}")
+        _TABLES[n] = tuple(
+            tuple((target, BITS * target, BITS * blank) for target in targets)
+            for blank, targets in enumerate(neighbour_table(n))
+        )
+    return _TABLES[n]
+
+
+def slide(state: int, target_shift: int, blank_shift: int) -> int:
+    """
+    Move the tile at target_shift into the empty square at blank_shift.
+    """
+    tile = (state >> target_shift) & MASK
+    return state - (tile << target_shift) + (tile << blank_shift)
+
+
+def successors(state: int, blank: int, n: int) -> Iterator[Tuple[int, int]]:
+    """
+    Yield (next_state, next_blank) for every legal move.
+    """
+    for target, target_shift, blank_shift in move_table(n)[blank]:
+        tile = (state >> target_shift) & MASK
+        yield state - (tile << target_shift) + (tile << blank_shift), target
+
+
+def is_solved(state: int, n: int) -> bool:
+    return state == GOALS[n]
+
+
+def state_is_solvable(state: int, n: int) -> bool:
+    return is_solvable(decode(state, n), n)
+
+
+def random_state(n: int, rng=None) -> int:
+    """
+    Return a random solvable, unsolved board as an int.
+    """
+    return encode(generate_new_puzzle(n, rng))
+
+
+def distances(n: int = 3) -> dict:
+    """
+    Return the optimal solution length of every solvable board, by breadth-first search from the goal.
+
+    Only practical for 3x3, which has 181,440 solvable boards.
+    """
+    table = move_table(n)
+    start = goal(n)
+    seen = {start: 0}
+    queue = deque([(start, n * n - 1)])
+    while queue:
+        state, blank = queue.popleft()
+        depth = seen[state] + 1
+        for target, target_shift, blank_shift in table[blank]:
+            tile = (state >> target_shift) & MASK
+            child = state - (tile << target_shift) + (tile << blank_shift)
+            if child not in seen:
+                seen[child] = depth
+                queue.append((child, target))
+    return seen
@@ -0,0 +1,146 @@
+"""
+Headless board state for the sliding puzzle.
+"""
+from array import array
+from typing import Iterable, Optional, Sequence
+
+from puzzle_core.solver import default_heuristic
+
+
+def cell_typecode(size: int) -> str:
+    """
+    Return the smallest unsigned array typecode that holds tile numbers below size.
+    """
+    if size <= 1 << 8:
+        return "B"
+    if size <= 1 << 16:
+        return "H"
+    return "L"
+
+
+class PuzzleBoard:
+    """
+    An n x n board stored as a flat array of tile numbers, 0 being the empty square.
+
+    The board keeps a running count of the cells that already hold their solved
+    value, so checking for a win costs O(1) instead of a comparison with a freshly
+    built solved board.
+
+    Attributes:
+        n (int): The board width.
+        cells (array): The tile numbers, row by row.
+        empty (int): The index of the empty square.
+        correct (int): The number of cells holding their solved value, the empty square included.
+    """
+
+    __slots__ = ("n", "cells", "empty", "correct")
+
+    def __init__(self, n: int, cells: Optional[Sequence[int]] = None) -> None:
+        size = n * n
+        self.n = n
+        self.cells = array(cell_typecode(size), cells if cells is not None else [*range(1, size), 0])
+        if len(self.cells) != size:
+            raise ValueError(f"a {n}x{n} board needs {size} cells, got {len(self.cells)}")
+        self.empty = self.cells.index(0)
+        self.correct = sum(1 for i, tile in enumerate(self.cells) if tile == (i + 1) % size)
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def __getitem__(self, index: int) -> int:
+        return self.cells[index]
+
+    def __iter__(self):
+        return iter(self.cells)
+
+    def __repr__(self) -> str:
+        return f"PuzzleBoard({self.n}, {self.cells.tolist()})"
+
+    def tolist(self) -> list:
+        return self.cells.tolist()
+
+    def is_solved(self) -> bool:
+        """
+        Check whether every cell holds its solved value.
+        """
+        return self.correct == len(self.cells)
+
+    def can_move(self, new_empty: int) -> bool:
+        """
+        Check whether the tile at new_empty is next to the empty square.
+        """
+        n, empty = self.n, self.empty
+        if new_empty == empty - n or new_empty == empty + n:
+            return 0 <= new_empty < len(self.cells)
+        if new_empty == empty - 1 or new_empty == empty + 1:
+            return new_empty // n == empty // n
+        return False
+
+    def move_empty(self, new_empty: int) -> None:
+        """
+        Slide the tile at new_empty into the empty square.
+
+        Only the two swapped cells can change state, so the solved count is
+        updated from those two alone. The caller is responsible for the move
+        being legal, see can_move().
+
+        Args:
+            new_empty (int): The index of the tile to slide, which becomes the empty square.
+        """
+        cells, empty = self.cells, self.empty
+        size = len(cells)
+        tile = cells[new_empty]
+        # tile leaves new_empty and lands on empty; the empty square goes the other way
+        self.correct += ((tile == (empty + 1) % size) - (tile == (new_empty + 1) % size)
+                         + (new_empty == size - 1) - (empty == size - 1))
+        cells[empty] = tile
+        cells[new_empty] = 0
+        self.empty = new_empty
+
+    def apply(self, moves: Iterable[int]) -> None:
+        """
+        Play a sequence of moves given as the indices the empty square moves to.
+        """
+        for new_empty in moves:
+            self.move_empty(new_empty)
+
+    def copy(self) -> "PuzzleBoard":
+        board = PuzzleBoard.__new__(PuzzleBoard)
+        board.n, board.empty, board.correct = self.n, self.empty, self.correct
+        board.cells = array(self.cells.typecode, self.cells)
+        return board
+
+
+class MeteredBoard(PuzzleBoard):
+    """
+    A PuzzleBoard that also keeps a lower bound on the moves left to solve it.
+
+    The bound is the Manhattan distance plus linear conflicts. It is computed
+    in full once, then every move adds the change it makes: the moved tile's
+    own Manhattan term, and the conflicts of the two lines the tile leaves and
+    enters across the move. A move never looks at the rest of the board, so
+    its cost does not grow with the board's area.
+
+    Attributes:
+        heuristic (ManhattanLinearConflict): The shared heuristic of the board width.
+        estimate (int): The current lower bound on the moves left, 0 once solved.
+    """
+
+    __slots__ = ("heuristic", "estimate")
+
+    def __init__(self, n: int, cells: Optional[Sequence[int]] = None) -> None:
+        super().__init__(n, cells)
+        self.heuristic = default_heuristic(n)
+        self.estimate = self.heuristic.estimate(self.cells)
+
+    def move_empty(self, new_empty: int) -> None:
+        # the change is measured on the board as it is before the move
+        self.estimate += self.heuristic.delta(self.cells, self.empty, new_empty)
+        super().move_empty(new_empty)
+
+    def copy(self) -> "MeteredBoard":
+        board = MeteredBoard.__new__(MeteredBoard)
+        board.n, board.empty, board.correct = self.n, self.empty, self.correct
+        board.cells = array(self.cells.typecode, self.cells)
+        board.heuristic, board.estimate = self.heuristic, self.estimate
+        return board
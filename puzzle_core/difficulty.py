@@ -0,0 +1,201 @@
+"""
+Boards of a chosen difficulty: an optimal solution length of exactly k, or inside a range.
+
+3x3 boards are drawn from all 181,440 solvable boards sorted by the distance
+the oracle file holds for them, so a board of any length comes out in
+microseconds. Wider boards are
+random walks from the goal, kept only when the pattern-database solver
+confirms their optimal length.
+"""
+import argparse
+import random
+from array import array
+from itertools import accumulate
+from typing import Optional, Sequence
+
+from puzzle_core.oracle import Oracle, open_oracle, unrank
+from puzzle_core.solver import neighbour_table
+
+LONGEST_3X3 = 31  # the most moves any 3x3 board needs
+
+
+class LayerTable:
+    """
+    Every solvable 3x3 board, sorted by its optimal solution length.
+
+    Attributes:
+        indexes (array): The boards' oracle indexes, shortest solutions first.
+        offsets (list): Where each length starts in indexes, plus the end. Length k
+            covers indexes[offsets[k]:offsets[k + 1]].
+    """
+
+    def __init__(self, oracle: Oracle) -> None:
+        table = bytes(oracle.table)
+        self.indexes = array("L", sorted(range(len(table)), key=table.__getitem__))
+        self.offsets = list(accumulate((table.count(depth) for depth in range(max(table) + 1)), initial=0))
+
+    @property
+    def longest(self) -> int:
+        return len(self.offsets) - 2
+
+    def count(self, low: int, high: int) -> int:
+        """
+        Return the number of boards whose optimal length is between low and high.
+        """
+        low, high = max(low, 0), min(high, self.longest)
+        return max(0, self.offsets[high + 1] - self.offsets[low]) if low <= high else 0
+
+    def sample(self, low: int, high: int, rng=None) -> list:
+        """
+        Return a board drawn uniformly from all boards with an optimal length between low and high.
+        """
+        if not self.count(low, high):
+            raise ValueError(f"no 3x3 board needs between {low} and {high} moves")
+        rng = rng or random
+        i = rng.randrange(self.offsets[max(low, 0)], self.offsets[min(high, self.longest) + 1])
+        return unrank(self.indexes[i])
+
+
+_LAYERS = None
+
+
+def layer_table() -> LayerTable:
+    """
+    Return the shared 3x3 layer table, sorting the oracle's boards on first use.
+    """
+    global _LAYERS
+    if _LAYERS is None:
+        _LAYERS = LayerTable(open_oracle())
+    return _LAYERS
+
+
+def random_walk(n: int, length: int, rng=None) -> list:
+    """
+    Return the board reached by moving the empty square length times from the goal, never straight back.
+
+    Its optimal solution is at most length moves and of the same parity.
+    """
+    rng = rng or random
+    steps = neighbour_table(n)
+    puzzle = [*range(1, n * n), 0]
+    blank, previous = n * n - 1, -1
+    for _ in range(length):
+        target = rng.choice([step for step in steps[blank] if step != previous])
+        puzzle[blank], puzzle[target] = puzzle[target], 0
+        blank, previous = target, blank
+    return puzzle
+
+
+def verified_puzzle(n: int, low: int, high: int, rng=None, max_candidates: int = 1000,
+                    max_nodes: Optional[int] = None) -> list:
+    """
+    Return a random walk whose optimal length, as found by the pattern-database solver, is between low and high.
+
+    The walk length starts at high and follows the lengths found: longer
+    while the boards come out too easy, shorter when one overshoots. It moves
+    in steps of two, because a walk and its board share their parity.
+
+    Raises:
+        RuntimeError: If no candidate fits within max_candidates tries, or the
+            searches together expand more than max_nodes nodes.
+    """
+    from puzzle_core.pdb import default_database, search
+
+    rng = rng or random
+    database = default_database(n)
+    walk = high
+    spent = 0
+    for _ in range(max_candidates):
+        puzzle = random_walk(n, walk, rng)
+        try:
+            result = search(puzzle, database, max_nodes=None if max_nodes is None else max_nodes - spent)
+        except RuntimeError:
+            raise RuntimeError(f"no {n}x{n} board between {low} and {high} moves in {max_nodes} nodes") from None
+        spent += result.nodes
+        length = len(result.moves)
+        if low <= length <= high:
+            return puzzle
+        if length < low:
+            walk += 2 * max(1, (low - length) // 2)
+        elif walk - 2 >= low:
+            walk -= 2
+    raise RuntimeError(f"no {n}x{n} board between {low} and {high} moves in {max_candidates} candidates")
+
+
+def generate_by_difficulty(len_board: int, low: int, high: Optional[int] = None, rng=None,
+                           max_nodes: Optional[int] = None) -> list:
+    """
+    Generate a solvable puzzle whose optimal solution takes between low and high moves.
+
+    Args:
+        len_board (int): The width of the board, 3 to 5.
+        low (int): The fewest moves of the optimal solution, at least 1.
+        high (int, optional): The most moves of the optimal solution. Defaults to low, i.e. exactly low moves.
+        rng (random.Random, optional): The source of randomness. Defaults to the random module.
+        max_nodes (int, optional): Give up with RuntimeError once the searches verifying
+            wider boards have expanded this many nodes. 3x3 boards need no search.
+
+    Returns:
+        list: The flat board, 0 being the empty square.
+    """
+    high = low if high is None else high
+    if not 1 <= low <= high:
+        raise ValueError(f"the lengths must satisfy 1 <= low <= high, got {low} and {high}")
+    if len_board == 3:
+        return layer_table().sample(low, high, rng)
+    # the pattern databases need NumPy, which the 3x3 path does without
+    from puzzle_core.pdb import PARTITIONS
+
+    if len_board not in PARTITIONS:
+        raise ValueError(f"optimal lengths are only known for widths {', '.join(map(str, sorted(PARTITIONS)))}")
+    return verified_puzzle(len_board, low, high, rng, max_nodes=max_nodes)
+
+
+def prepare(len_board: int) -> None:
+    """
+    Load, or build on first use, the tables generate_by_difficulty needs for a width.
+
+    Sorting the 3x3 layers takes about 0.1 s and building a pattern database
+    half a minute, so callers with a time budget do this ahead.
+    """
+    if len_board == 3:
+        layer_table()
+    else:
+        from puzzle_core.pdb import default_database
+
+        default_database(len_board)
+
+
+def parse_lengths(text: str) -> tuple:
+    """
+    Parse "k" or "low-high" into a (low, high) pair of solution lengths, for argparse.
+    """
+    low, _, high = text.partition("-")
+    low, high = int(low), int(high or low)
+    if not 1 <= low <= high:
+        raise argparse.ArgumentTypeError(f"the lengths must satisfy 1 <= low <= high, got {text}")
+    return low, high
+
+
+def level_pack(len_board: int, bands: Sequence[tuple], per_band: int, rng=None) -> list:
+    """
+    Return per_band boards for each (low, high) band of solution lengths, easiest band first.
+    """
+    return [[generate_by_difficulty(len_board, low, high, rng) for _ in range(per_band)] for low, high in bands]
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    width = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    lengths = parse_lengths(sys.argv[2]) if len(sys.argv) > 2 else (20, 22)
+    count = int(sys.argv[3]) if len(sys.argv) > 3 else 1000
+    start_time = time.perf_counter()
+    generate_by_difficulty(width, *lengths)
+    print(f"first board in {time.perf_counter() - start_time:.2f}s")
+    start_time = time.perf_counter()
+    boards = [generate_by_difficulty(width, *lengths) for _ in range(count)]
+    elapsed = time.perf_counter() - start_time
+    print(f"{count} boards of {lengths[0]}-{lengths[1]} moves in {elapsed:.3f}s ({count / elapsed:,.0f} boards/s)")
+    print(boards[0])
@@ -0,0 +1,161 @@
+"""
+The optimal distance of every solvable 3x3 board, in a memory-mapped file of one byte per board.
+
+A solvable 3x3 board is its empty square's cell plus an even permutation of
+the eight tiles read in order. The Lehmer code of an even permutation is
+fixed by its first six digits, because the seventh is whatever makes the
+parity even and the eighth is always 0. Numbering the empty cell times
+8!/2 plus those six digits therefore gives every solvable board its own
+index below 9 * 8!/2 = 181,440, with no gaps, and the file is exactly that
+many bytes.
+
+The file ships next to this module, so opening it is all the startup there
+is: distances, hints and whole solutions are table lookups. It is written
+by a breadth-first search from the goal, about 2 s, which only runs when
+the file is missing or has the wrong size, or when asked for with
+
+    python -m puzzle_core.oracle
+"""
+import mmap
+import os
+from typing import Optional, Sequence
+
+from puzzle_core.bitboard import decode, distances
+from puzzle_core.solver import neighbour_table
+
+WIDTH = 3
+TILES = WIDTH * WIDTH - 1
+ARRANGEMENTS = 20160  # 8!/2 even orders of the eight tiles
+STATES = WIDTH * WIDTH * ARRANGEMENTS
+PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "oracle3x3.bin")
+NEIGHBOURS = neighbour_table(WIDTH)
+
+
+def rank(puzzle: Sequence[int]) -> int:
+    """
+    Return the index of a solvable 3x3 board, raising ValueError for an unsolvable one.
+    """
+    blank = puzzle.index(0)
+    code, parity, seen = 0, 0, 0
+    i = 0
+    for tile in puzzle:
+        if not tile:
+            continue
+        # the Lehmer digit: how many of the tiles still to come are smaller than this one
+        smaller = tile - 1 - bin(seen & ((1 << tile) - 1)).count("1")
+        seen |= 1 << tile
+        parity += smaller
+        if i < TILES - 2:
+            code = code * (TILES - i) + smaller
+        i += 1
+    if parity & 1:
+        raise ValueError("the board is not solvable")
+    return blank * ARRANGEMENTS + code
+
+
+def unrank(index: int) -> list:
+    """
+    Return the board of an index, the inverse of rank().
+    """
+    blank, code = divmod(index, ARRANGEMENTS)
+    # the six Lehmer digits, unrolled because the difficulty tables unrank a board per draw
+    code, d6 = divmod(code, 3)
+    code, d5 = divmod(code, 4)
+    code, d4 = divmod(code, 5)
+    code, d3 = divmod(code, 6)
+    d1, d2 = divmod(code, 7)
+    left = list(range(1, TILES + 1))
+    tiles = [left.pop(d1), left.pop(d2), left.pop(d3), left.pop(d4), left.pop(d5), left.pop(d6)]
+    # the seventh digit makes the permutation even, the eighth is always 0
+    if (d1 + d2 + d3 + d4 + d5 + d6) & 1:
+        left.reverse()
+    tiles += left
+    tiles.insert(blank, 0)
+    return tiles
+
+
+def build(path: str = PATH) -> None:
+    """
+    Write the distance of every board to path, by breadth-first search from the goal.
+
+    The file is written under a temporary name and renamed, so a reader never sees half of it.
+    """
+    table = bytearray(STATES)
+    for state, depth in distances(WIDTH).items():
+        table[rank(decode(state, WIDTH))] = depth
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as f:
+        f.write(table)
+    os.replace(temporary, path)
+
+
+class Oracle:
+    """
+    Exact answers about 3x3 boards from the table of distances.
+
+    Attributes:
+        table: One byte per board index, the fewest moves that solve it.
+    """
+
+    def __init__(self, table) -> None:
+        if len(table) != STATES:
+            raise ValueError(f"an oracle table has {STATES} entries, got {len(table)}")
+        self.table = table
+
+    def distance(self, puzzle: Sequence[int]) -> int:
+        """
+        Return the fewest moves that solve the board.
+        """
+        return self.table[rank(puzzle)]
+
+    def next_move(self, puzzle: Sequence[int]) -> Optional[int]:
+        """
+        Return the index the empty square should move to, or None if solved.
+        """
+        left = self.table[rank(puzzle)]
+        if left == 0:
+            return None
+        board = list(puzzle)
+        blank = board.index(0)
+        for target in NEIGHBOURS[blank]:
+            board[blank], board[target] = board[target], 0
+            closer = self.table[rank(board)] < left
+            board[target], board[blank] = board[blank], 0
+            if closer:
+                return target
+        raise ValueError("the table does not match the board")
+
+    def solution(self, puzzle: Sequence[int]) -> list:
+        """
+        Return an optimal list of moves for the board.
+        """
+        board = list(puzzle)
+        moves = []
+        move = self.next_move(board)
+        while move is not None:
+            blank = board.index(0)
+            board[blank], board[move] = board[move], 0
+            moves.append(move)
+            move = self.next_move(board)
+        return moves
+
+
+def open_oracle(path: str = PATH) -> Oracle:
+    """
+    Memory-map the oracle file, building it first if it is missing or cut short.
+    """
+    if not os.path.exists(path) or os.path.getsize(path) != STATES:
+        build(path)
+    with open(path, "rb") as f:
+        return Oracle(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    target = sys.argv[1] if len(sys.argv) > 1 else PATH
+    start_time = time.perf_counter()
+    build(target)
+    print(f"{STATES} distances written to {target} in {time.perf_counter() - start_time:.2f}s")
@@ -0,0 +1,381 @@
+"""
+Additive pattern-database solver for 4x4 and 5x5 boards.
+
+The tiles are split into disjoint groups. For each group a table stores the
+fewest moves of that group's tiles needed to bring them home, when the other
+tiles can be moved out of the way for free but the group's tiles still have
+to wait for the blank. The tables of disjoint groups only count their own
+tiles' moves, so their sum is still a lower bound on the real solution
+length. Because tiles of a group block each other and the blank, it is a
+tighter one than the Manhattan distance plus linear conflicts.
+
+Tables are built with a breadth-first search vectorised over NumPy arrays,
+which is why this module needs NumPy while the rest of puzzle_core does not.
+They can be saved to one file per width and memory-mapped back, so any number
+of processes share a single copy through the page cache.
+"""
+import mmap
+import os
+import struct
+import time
+from typing import Optional, Sequence
+
+import numpy as np
+
+from puzzle_core.generator import board_width, is_solvable
+from puzzle_core.solver import FOUND, SearchResult, neighbour_table
+
+# Korf's 6-6-3 split for 4x4 and a 5-5-5-5-4 split for 5x5. A 6-6-6-6 split of 5x5
+# would need 25**6 bytes per table plus four times that while it is built.
+PARTITIONS = {
+    3: ((1, 2, 3, 4), (5, 6, 7, 8)),
+    4: ((1, 5, 6, 9, 10, 13), (7, 8, 11, 12, 14, 15), (2, 3, 4)),
+    5: ((1, 2, 3, 6, 7), (4, 5, 8, 9, 10), (11, 12, 16, 17, 21), (13, 14, 18, 19, 22), (15, 20, 23, 24)),
+}
+
+UNSEEN = 255
+MAGIC = b"PDB2"  # PDB1 files hold the tables of the older build, which ignored the blank
+HEADER = struct.Struct("<4sBB")  # magic, board width, number of groups
+CACHE = os.path.join(os.path.expanduser("~"), ".cache", "puzzle_core")
+
+
+def _flood(blanks, occupied, n: int):
+    """
+    Grow each mask of blank cells over the free cells it can reach, which costs no group moves.
+    """
+    board = (1 << n * n) - 1
+    column = sum(1 << row * n for row in range(n))
+    not_first, not_last = board & ~column, board & ~(column << n - 1)
+    free = ~occupied & board
+    while True:
+        grown = blanks | ((blanks << 1) & not_first) | ((blanks >> 1) & not_last) | (blanks << n) | (blanks >> n)
+        grown &= free
+        if np.array_equal(grown, blanks):
+            return blanks
+        blanks = grown
+
+
+def build_table(n: int, group: Sequence[int]) -> bytes:
+    """
+    Build the pattern database of one tile group.
+
+    A group state is indexed as sum(position_i * size**i) over the group's tiles,
+    so a table has size**len(group) entries. Slots where two tiles would share
+    a cell are never reached and keep the value 255.
+
+    The search runs over the group's tiles and the blank. Moving any other
+    tile is free, so within one layer the blank spreads over every free cell
+    it can reach, and only a group tile sliding into the blank costs a move.
+    An entry is the fewest group moves over all positions of the blank.
+
+    Args:
+        n (int): The board width.
+        group (Sequence[int]): The tiles of the group.
+
+    Returns:
+        bytes: The move counts, one byte per index.
+    """
+    size = n * n
+    k = len(group)
+    index = np.int32 if size ** k < 1 << 31 else np.int64
+    mask = np.uint32 if size <= 32 else np.uint64
+    weights = np.array([size ** i for i in range(k)], dtype=index)
+    # a missing neighbour is the extra cell `size`, whose bit is never set.
+    steps = np.full((size, 4), size, dtype=np.uint8)
+    for cell, targets in enumerate(neighbour_table(n)):
+        steps[cell, :len(targets)] = targets
+    bit = np.zeros(size + 1, dtype=mask)
+    bit[:size] = [1 << cell for cell in range(size)]
+    table = np.full(size ** k, UNSEEN, dtype=np.uint8)
+    # for each group state, the blank cells it has been reached with; the next layer's are gathered in pending
+    reached = np.zeros(size ** k, dtype=mask)
+    pending = np.zeros(size ** k, dtype=mask)
+    states = np.array([sum((tile - 1) * size ** i for i, tile in enumerate(group))], dtype=index)
+    blanks = bit[[size - 1]]
+    depth = 0
+    while states.size:
+        # merge the blanks a state is entered with, then spread them for free
+        np.bitwise_or.at(pending, states, blanks)
+        states = np.flatnonzero(pending).astype(index)
+        blanks = pending[states]
+        pending[states] = 0
+        positions = ((states[:, None] // weights) % size).astype(np.uint8)
+        occupied = np.bitwise_or.reduce(bit[positions], axis=1)
+        blanks = _flood(blanks, occupied, n) & ~reached[states]
+        new = blanks != 0
+        states, blanks, positions = states[new], blanks[new], positions[new]
+        reached[states] |= blanks
+        table[states[table[states] == UNSEEN]] = depth
+        # one group move: a tile slides into a neighbouring blank, and the blank takes its cell
+        children, child_blanks = [], []
+        for i in range(k):
+            cell = positions[:, i]
+            for d in range(4):
+                target = steps[cell, d]
+                into = (blanks & bit[target]) != 0
+                children.append(states[into] + (target[into].astype(index) - cell[into]) * weights[i])
+                child_blanks.append(bit[cell[into]])
+        states, blanks = np.concatenate(children), np.concatenate(child_blanks)
+        depth += 1
+    return table.tobytes()
+
+
+class PatternDatabase:
+    """
+    The additive heuristic made of one table per tile group.
+
+    The board mirrored in its main diagonal is a board of the same puzzle, so
+    the same tables also give a second bound through the mirror image. The
+    search uses the larger of the two.
+
+    Attributes:
+        n (int): The board width.
+        groups (tuple): The tile groups.
+        tables (list): One table per group, indexable by an int index.
+        group_of (list): For each tile, the index of its group.
+        weight_of (list): For each tile, its place value inside its group's index.
+        mirror (list): For each cell, the cell it lands on in the mirror image.
+        mirror_group_of (list): Like group_of, for the tile a tile becomes in the mirror image.
+        mirror_weight_of (list): Like weight_of, for the tile a tile becomes in the mirror image.
+    """
+
+    def __init__(self, n: int, groups: Optional[Sequence[Sequence[int]]] = None, tables: Optional[list] = None):
+        self.n = n
+        self.groups = tuple(tuple(g) for g in (groups or PARTITIONS[n]))
+        tiles = sorted(t for g in self.groups for t in g)
+        if tiles != list(range(1, n * n)):
+            raise ValueError("the groups must cover every tile exactly once")
+        self.tables = tables if tables is not None else [build_table(n, g) for g in self.groups]
+        self.group_of = [0] * (n * n)
+        self.weight_of = [0] * (n * n)
+        for g, group in enumerate(self.groups):
+            for i, tile in enumerate(group):
+                self.group_of[tile] = g
+                self.weight_of[tile] = (n * n) ** i
+        self.mirror = [(cell % n) * n + cell // n for cell in range(n * n)]
+        self.mirror_group_of = [0] + [self.group_of[self.mirror[t - 1] + 1] for t in range(1, n * n)]
+        self.mirror_weight_of = [0] + [self.weight_of[self.mirror[t - 1] + 1] for t in range(1, n * n)]
+
+    def indexes(self, state: Sequence[int]) -> list:
+        """
+        Return the table index of every group for a board.
+        """
+        result = [0] * len(self.groups)
+        for position, tile in enumerate(state):
+            if tile:
+                result[self.group_of[tile]] += position * self.weight_of[tile]
+        return result
+
+    def mirror_indexes(self, state: Sequence[int]) -> list:
+        """
+        Return the table index of every group for the mirror image of a board.
+        """
+        result = [0] * len(self.groups)
+        for position, tile in enumerate(state):
+            if tile:
+                result[self.mirror_group_of[tile]] += self.mirror[position] * self.mirror_weight_of[tile]
+        return result
+
+    def estimate(self, state: Sequence[int]) -> int:
+        """
+        Return the additive lower bound for a board.
+        """
+        direct = sum(table[i] for table, i in zip(self.tables, self.indexes(state)))
+        mirrored = sum(table[i] for table, i in zip(self.tables, self.mirror_indexes(state)))
+        return max(direct, mirrored)
+
+
+def save_database(database: PatternDatabase, path: str) -> None:
+    """
+    Write a database to one file: the header, each group as its length and tiles, then the tables back to back.
+
+    The file is written under a temporary name and renamed, so a reader never sees half of it.
+    """
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as f:
+        f.write(HEADER.pack(MAGIC, database.n, len(database.groups)))
+        for group in database.groups:
+            f.write(bytes([len(group), *group]))
+        for table in database.tables:
+            f.write(table)
+    os.replace(temporary, path)
+
+
+def open_database(path: str) -> PatternDatabase:
+    """
+    Memory-map a database written by save_database().
+
+    The tables are read-only views of the mapping, so the pages are loaded on
+    first use and shared with every other process that maps the same file.
+    """
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, n, count = HEADER.unpack_from(mapped)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a pattern database")
+    offset = HEADER.size
+    groups = []
+    for _ in range(count):
+        k = mapped[offset]
+        groups.append(tuple(mapped[offset + 1:offset + 1 + k]))
+        offset += 1 + k
+    view = memoryview(mapped)
+    tables = []
+    for group in groups:
+        size = (n * n) ** len(group)
+        tables.append(view[offset:offset + size])
+        offset += size
+    if offset != len(mapped):
+        raise ValueError(f"{path} is truncated")
+    return PatternDatabase(n, groups, tables)
+
+
+def cached_database(n: int, directory: str) -> PatternDatabase:
+    """
+    Return the memory-mapped database for width n from directory, building and saving it first if it is missing.
+
+    A file that is cut short or written in an older format is built again.
+    """
+    path = os.path.join(directory, f"pdb{n}x{n}.bin")
+    if os.path.exists(path):
+        try:
+            return open_database(path)
+        except ValueError:
+            pass
+    os.makedirs(directory, exist_ok=True)
+    save_database(PatternDatabase(n), path)
+    return open_database(path)
+
+
+_DATABASES = {}
+
+
+def default_database(n: int) -> PatternDatabase:
+    """
+    Return the pattern database for width n, mapped from CACHE and built there on first use.
+    """
+    if n not in _DATABASES:
+        _DATABASES[n] = cached_database(n, CACHE)
+    return _DATABASES[n]
+
+
+def search(puzzle: Sequence[int], database: Optional[PatternDatabase] = None, weight: float = 1.0,
+           max_nodes: Optional[int] = None) -> SearchResult:
+    """
+    Run IDA* guided by a pattern database.
+
+    With weight 1 the solution is optimal. A larger weight inflates the estimate,
+    which finds solutions much faster at the cost of some extra moves.
+
+    Args:
+        puzzle (Sequence[int]): The flat board.
+        database (PatternDatabase, optional): Defaults to the standard split for the width.
+        weight (float): Multiplier on the estimate.
+        max_nodes (int, optional): Give up with RuntimeError after this many expansions.
+
+    Returns:
+        SearchResult: The moves plus the search statistics.
+    """
+    n = board_width(puzzle)
+    if not is_solvable(puzzle, n):
+        raise ValueError("the board is not solvable")
+    database = database or default_database(n)
+    tables, group_of, weight_of = database.tables, database.group_of, database.weight_of
+    mirror, mirror_group_of, mirror_weight_of = database.mirror, database.mirror_group_of, database.mirror_weight_of
+    state = list(puzzle)
+    index = database.indexes(state)
+    mirror_index = database.mirror_indexes(state)
+    steps = neighbour_table(n)
+    path = []
+    nodes = 0
+    limit = max_nodes if max_nodes is not None else float("inf")
+
+    def dfs(blank: int, g: int, h1: int, h2: int, bound: float, previous: int) -> float:
+        nonlocal nodes
+        h = h1 if h1 > h2 else h2
+        f = g + weight * h
+        if f > bound:
+            return f
+        if h == 0:
+            return FOUND
+        nodes += 1
+        if nodes > limit:
+            raise RuntimeError(f"gave up after {max_nodes} nodes")
+        smallest = float("inf")
+        for target in steps[blank]:
+            if target == previous:
+                continue
+            tile = state[target]
+            group = group_of[tile]
+            table = tables[group]
+            old = index[group]
+            new = old + (blank - target) * weight_of[tile]
+            index[group] = new
+            m_group = mirror_group_of[tile]
+            m_table = tables[m_group]
+            m_old = mirror_index[m_group]
+            m_new = m_old + (mirror[blank] - mirror[target]) * mirror_weight_of[tile]
+            mirror_index[m_group] = m_new
+            state[blank], state[target] = tile, 0
+            path.append(target)
+            result = dfs(target, g + 1, h1 - table[old] + table[new], h2 - m_table[m_old] + m_table[m_new],
+                         bound, blank)
+            if result == FOUND:
+                return FOUND
+            path.pop()
+            state[target], state[blank] = tile, 0
+            index[group] = old
+            mirror_index[m_group] = m_old
+            if result < smallest:
+                smallest = result
+        return smallest
+
+    start = time.perf_counter()
+    h1 = sum(table[i] for table, i in zip(tables, index))
+    h2 = sum(table[i] for table, i in zip(tables, mirror_index))
+    bound = weight * max(h1, h2)
+    blank = state.index(0)
+    while True:
+        result = dfs(blank, 0, h1, h2, bound, -1)
+        if result == FOUND:
+            return SearchResult(path, nodes, time.perf_counter() - start)
+        bound = result
+
+
+def solve_bounded(puzzle: Sequence[int], database: Optional[PatternDatabase] = None, weight: float = 2.0,
+                  max_nodes: int = 2_000_000) -> SearchResult:
+    """
+    Find a good solution within a fixed node budget.
+
+    Each attempt that runs out of budget is retried with the weight raised by a
+    half, so hard 5x5 boards trade optimality for a bounded running time.
+
+    Returns:
+        SearchResult: The first solution found. Its nodes and seconds cover every attempt.
+    """
+    nodes, seconds = 0, 0.0
+    while True:
+        start = time.perf_counter()
+        try:
+            result = search(puzzle, database, weight, max_nodes)
+        except RuntimeError:
+            nodes += max_nodes
+            seconds += time.perf_counter() - start
+            weight *= 1.5
+            continue
+        return SearchResult(result.moves, nodes + result.nodes, seconds + result.seconds)
+
+
+if __name__ == "__main__":
+    import sys
+
+    from puzzle_core.generator import generate_new_puzzle
+
+    width = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    board = generate_new_puzzle(width)
+    start_time = time.perf_counter()
+    default_database(width)
+    print(f"tables built in {time.perf_counter() - start_time:.2f}s")
+    outcome = search(board) if width < 5 else solve_bounded(board)
+    print(f"{board} -> {len(outcome.moves)} moves, {outcome.nodes} nodes in {outcome.seconds:.2f}s "
+          f"({outcome.nodes_per_second:,.0f} nodes/s)")
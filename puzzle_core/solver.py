@@ -0,0 +1,228 @@
+"""
+Optimal IDA* solver for the n x n sliding puzzle.
+
+A board is a flat row-major sequence with 0 for the empty square. A move is
+written as the index the empty square moves to, which is the index of the tile
+that slides. This is the same value the games call ``new_empty``.
+"""
+import time
+from functools import lru_cache
+from typing import NamedTuple, Optional, Sequence
+
+from puzzle_core.generator import board_width, is_solvable
+
+FOUND = -1
+LINE_CACHE_SIZE = 1 << 15  # line conflicts a heuristic remembers, per direction
+
+
+class SearchResult(NamedTuple):
+    """
+    Outcome of one IDA* search.
+
+    Attributes:
+        moves (list): The indices the empty square moves to, in order.
+        nodes (int): The number of nodes expanded.
+        seconds (float): Wall-clock time spent searching.
+    """
+    moves: list
+    nodes: int
+    seconds: float
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.seconds if self.seconds > 0 else float("inf")
+
+
+def goal_state(n: int) -> tuple:
+    """
+    Return the solved n x n board: 1 .. n*n-1 followed by the empty square.
+    """
+    return tuple(range(1, n * n)) + (0,)
+
+
+def neighbour_table(n: int) -> tuple:
+    """
+    Return, for each index of the empty square, the indices it can move to.
+    """
+    table = []
+    for i in range(n * n):
+        row, col = divmod(i, n)
+        steps = []
+        if row > 0:
+            steps.append(i - n)
+        if row < n - 1:
+            steps.append(i + n)
+        if col > 0:
+            steps.append(i - 1)
+        if col < n - 1:
+            steps.append(i + 1)
+        table.append(tuple(steps))
+    return tuple(table)
+
+
+def _conflicts(goal_order: list) -> int:
+    """
+    Return how many tiles must leave a line so the rest are in goal order.
+
+    Args:
+        goal_order (list): The goal offsets of the line's own tiles, in board order.
+    """
+    if len(goal_order) < 2:
+        return 0
+    longest = [1] * len(goal_order)
+    for i in range(1, len(goal_order)):
+        for j in range(i):
+            if goal_order[j] < goal_order[i] and longest[j] + 1 > longest[i]:
+                longest[i] = longest[j] + 1
+    return len(goal_order) - max(longest)
+
+
+class ManhattanLinearConflict:
+    """
+    Manhattan distance plus linear conflicts, updated per move.
+
+    Each tile that must leave its row or column to let another tile pass adds
+    two moves to the Manhattan distance, which keeps the estimate admissible.
+    """
+
+    def __init__(self, n: int) -> None:
+        self.n = n
+        size = n * n
+        self.distance = [[0] * size] + [
+            [abs((t - 1) // n - i // n) + abs((t - 1) % n - i % n) for i in range(size)]
+            for t in range(1, size)
+        ]
+        self.rows = tuple(tuple(range(r * n, r * n + n)) for r in range(n))
+        self.cols = tuple(tuple(range(c, size, n)) for c in range(n))
+        # bounded, as one heuristic is shared by every search and board of its width for the whole session
+        self.row_conflict = lru_cache(maxsize=LINE_CACHE_SIZE)(self._row_conflict)
+        self.col_conflict = lru_cache(maxsize=LINE_CACHE_SIZE)(self._col_conflict)
+
+    def _row_conflict(self, row: int, tiles: tuple) -> int:
+        n = self.n
+        return _conflicts([(t - 1) % n for t in tiles if t and (t - 1) // n == row])
+
+    def _col_conflict(self, col: int, tiles: tuple) -> int:
+        n = self.n
+        return _conflicts([(t - 1) // n for t in tiles if t and (t - 1) % n == col])
+
+    def estimate(self, state: Sequence[int]) -> int:
+        """
+        Return the full heuristic value of a board.
+        """
+        distance = self.distance
+        total = sum(distance[t][i] for i, t in enumerate(state))
+        for r, cells in enumerate(self.rows):
+            total += 2 * self.row_conflict(r, tuple(state[i] for i in cells))
+        for c, cells in enumerate(self.cols):
+            total += 2 * self.col_conflict(c, tuple(state[i] for i in cells))
+        return total
+
+    def delta(self, state: list, blank: int, target: int) -> int:
+        """
+        Return the change in the estimate when the tile at target slides into blank.
+
+        The board must still be in its state before the move. A horizontal move
+        keeps the order of the tile's row, so only the two columns it leaves and
+        enters are rescored, and the other way round for a vertical move.
+        """
+        n = self.n
+        tile = state[target]
+        change = self.distance[tile][blank] - self.distance[tile][target]
+        if target // n == blank // n:
+            offset = blank // n
+            old_line, new_line = target % n, blank % n
+            cells_old, cells_new = self.cols[old_line], self.cols[new_line]
+            score = self.col_conflict
+        else:
+            offset = blank % n
+            old_line, new_line = target // n, blank // n
+            cells_old, cells_new = self.rows[old_line], self.rows[new_line]
+            score = self.row_conflict
+        before_old = [state[i] for i in cells_old]
+        before_new = [state[i] for i in cells_new]
+        change -= 2 * (score(old_line, tuple(before_old)) + score(new_line, tuple(before_new)))
+        before_old[offset] = 0
+        before_new[offset] = tile
+        change += 2 * (score(old_line, tuple(before_old)) + score(new_line, tuple(before_new)))
+        return change
+
+
+_HEURISTICS = {}
+
+
+def default_heuristic(n: int) -> ManhattanLinearConflict:
+    """
+    Return a shared Manhattan plus linear-conflict heuristic for width n.
+    """
+    if n not in _HEURISTICS:
+        _HEURISTICS[n] = ManhattanLinearConflict(n)
+    return _HEURISTICS[n]
+
+
+def search(puzzle: Sequence[int], heuristic=None, max_nodes: Optional[int] = None) -> SearchResult:
+    """
+    Find an optimal solution with iterative-deepening A*.
+
+    Args:
+        puzzle (Sequence[int]): The flat board.
+        heuristic (optional): An admissible heuristic with ``estimate(state)`` and
+            ``delta(state, blank, target)``. Defaults to Manhattan plus linear conflicts.
+        max_nodes (int, optional): Give up with RuntimeError after this many expansions.
+
+    Returns:
+        SearchResult: The moves plus the search statistics.
+    """
+    n = board_width(puzzle)
+    if not is_solvable(puzzle, n):
+        raise ValueError("the board is not solvable")
+    heuristic = heuristic or default_heuristic(n)
+    state = list(puzzle)
+    steps = neighbour_table(n)
+    estimate, delta = heuristic.estimate, heuristic.delta
+    path = []
+    nodes = 0
+    limit = max_nodes if max_nodes is not None else float("inf")
+
+    def dfs(blank: int, g: int, h: int, bound: int, previous: int) -> int:
+        nonlocal nodes
+        f = g + h
+        if f > bound:
+            return f
+        if h == 0:
+            return FOUND
+        nodes += 1
+        if nodes > limit:
+            raise RuntimeError(f"gave up after {max_nodes} nodes")
+        smallest = 1 << 30
+        for target in steps[blank]:
+            if target == previous:
+                continue
+            child_h = h + delta(state, blank, target)
+            state[blank], state[target] = state[target], 0
+            path.append(target)
+            result = dfs(target, g + 1, child_h, bound, blank)
+            if result == FOUND:
+                return FOUND
+            path.pop()
+            state[target], state[blank] = state[blank], 0
+            if result < smallest:
+                smallest = result
+        return smallest
+
+    start = time.perf_counter()
+    h = estimate(state)
+    bound = h
+    blank = state.index(0)
+    while True:
+        result = dfs(blank, 0, h, bound, -1)
+        if result == FOUND:
+            return SearchResult(path, nodes, time.perf_counter() - start)
+        bound = result
+
+
+def solve(puzzle: Sequence[int], heuristic=None) -> list:
+    """
+    Return an optimal list of moves for the board.
+    """
+    return search(puzzle, heuristic).moves
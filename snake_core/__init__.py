@@ -0,0 +1,7 @@
+"""
+Headless engine for the snake game of assignment3.
+
+The turtle game draws what these modules compute. Positions are integer cell
+indices on the play-area grid instead of float turtle coordinates, so every
+lookup is exact and costs the same however long the snake grows.
+"""
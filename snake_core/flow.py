@@ -0,0 +1,76 @@
+"""
+Breadth-first flow field towards the snake's head, shared by every monster.
+"""
+from array import array
+from collections import deque
+from typing import Optional, Sequence
+
+from snake_core.grid import OccupancyGrid, cell_typecode
+
+UNREACHED = 0xFFFFFFFF  # past any distance, as "L" holds at least 32 bits
+
+
+class FlowField:
+    """
+    Shortest-path distances to one target cell and the next step along them.
+
+    update() runs one breadth-first search from the target over the whole grid.
+    Every cell it reaches records the neighbour it was reached from, so any
+    number of pursuers find their next cell with one lookup each.
+
+    Blocked cells are not walked through. A blocked cell next to an open one
+    still gets a next step, so a pursuer standing on one can leave it.
+
+    Attributes:
+        grid (OccupancyGrid): The grid the field covers.
+        target (int): The cell the field leads to, None before the first update.
+        distance (array): Steps from each cell to the target, UNREACHED if there is no path.
+        toward (array): The next cell on a shortest path from each cell, the
+            cell itself at the target or where there is no path.
+    """
+
+    __slots__ = ("grid", "target", "distance", "toward", "neighbours")
+
+    def __init__(self, grid: OccupancyGrid) -> None:
+        self.grid = grid
+        self.target = None
+        self.distance = array("L", [UNREACHED]) * len(grid)
+        self.toward = array(cell_typecode(len(grid)), range(len(grid)))
+        # neighbours in the order right, up, left, down
+        self.neighbours = tuple(
+            tuple(n for n in (grid.step(cell, 1, 0), grid.step(cell, 0, 1),
+                              grid.step(cell, -1, 0), grid.step(cell, 0, -1)) if n is not None)
+            for cell in range(len(grid))
+        )
+
+    def update(self, target: int, blocked: Optional[Sequence[int]] = None) -> None:
+        """
+        Recompute the field from scratch.
+
+        Args:
+            target (int): The cell every path leads to.
+            blocked (Sequence[int], optional): Per-cell counts, such as the grid's
+                snake counts, where non-zero cells cannot be walked through.
+        """
+        size = len(self.grid)
+        distance = self.distance = array("L", [UNREACHED]) * size
+        toward = self.toward = array(cell_typecode(size), range(size))
+        neighbours = self.neighbours
+        self.target = target
+        distance[target] = 0
+        queue = deque([target])
+        while queue:
+            cell = queue.popleft()
+            depth = distance[cell] + 1
+            for n in neighbours[cell]:
+                if distance[n] == UNREACHED:
+                    distance[n] = depth
+                    toward[n] = cell
+                    if blocked is None or not blocked[n]:
+                        queue.append(n)
+
+    def next_cell(self, cell: int) -> int:
+        """
+        Return the cell one step closer to the target, or cell itself if there is none.
+        """
+        return self.toward[cell]
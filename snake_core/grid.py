@@ -0,0 +1,186 @@
+"""
+Occupancy grid of the play area.
+"""
+import random
+from array import array
+from collections import deque
+from typing import Iterator, Optional
+
+
+def cell_typecode(size: int) -> str:
+    """
+    Return the smallest unsigned array typecode that holds cell indices below size.
+    """
+    if size <= 1 << 8:
+        return "B"
+    if size <= 1 << 16:
+        return "H"
+    return "L"
+
+
+class FreeCells:
+    """
+    The set of empty cells, with O(1) insertion, removal and uniform random choice.
+
+    The cells are kept unordered in a dense array and every cell remembers
+    its slot, so a removal moves the last cell into the hole instead of
+    shifting the rest.
+    """
+
+    __slots__ = ("cells", "slot")
+
+    def __init__(self, size: int) -> None:
+        self.cells = array(cell_typecode(size), range(size))
+        self.slot = array("l", range(size))
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def __contains__(self, cell: int) -> bool:
+        return self.slot[cell] >= 0
+
+    def add(self, cell: int) -> None:
+        if self.slot[cell] < 0:
+            self.slot[cell] = len(self.cells)
+            self.cells.append(cell)
+
+    def discard(self, cell: int) -> None:
+        slot = self.slot[cell]
+        if slot >= 0:
+            last = self.cells.pop()
+            if last != cell:
+                self.cells[slot] = last
+                self.slot[last] = slot
+            self.slot[cell] = -1
+
+    def sample(self, rng: Optional[random.Random] = None) -> Optional[int]:
+        """
+        Return a random empty cell, or None if there is none.
+        """
+        if not self.cells:
+            return None
+        return self.cells[(rng or random).randrange(len(self.cells))]
+
+
+class OccupancyGrid:
+    """
+    Per-cell counts of snake segments and food on a cols x rows grid.
+
+    Cell (col, row) has index row * cols + col, row 0 being the bottom row.
+    Counts rather than flags are kept because a snake that turns back on
+    itself can cover a cell twice. Monsters, which need to be told apart,
+    are kept in a SpatialHash over the same cells.
+
+    Everything that stands on a cell, monsters included, is also counted in
+    load, and the cells with no load at all are kept in free.
+
+    Attributes:
+        cols (int): The number of columns.
+        rows (int): The number of rows.
+        snake (array): Snake segments per cell.
+        food (array): Food items per cell.
+        load (array): Snake segments, food and monsters per cell.
+        free (FreeCells): The cells with nothing on them.
+    """
+
+    __slots__ = ("cols", "rows", "snake", "food", "load", "free")
+
+    def __init__(self, cols: int, rows: int) -> None:
+        self.cols = cols
+        self.rows = rows
+        self.snake = array("H", bytes(2 * cols * rows))
+        self.food = array("H", bytes(2 * cols * rows))
+        self.load = array("H", bytes(2 * cols * rows))
+        self.free = FreeCells(cols * rows)
+
+    def __len__(self) -> int:
+        return self.cols * self.rows
+
+    def index(self, col: int, row: int) -> int:
+        return row * self.cols + col
+
+    def col_row(self, cell: int) -> tuple:
+        row, col = divmod(cell, self.cols)
+        return col, row
+
+    def inside(self, col: int, row: int) -> bool:
+        return 0 <= col < self.cols and 0 <= row < self.rows
+
+    def step(self, cell: int, d_col: int, d_row: int) -> Optional[int]:
+        """
+        Return the cell next to cell in the given direction, or None past the border.
+        """
+        row, col = divmod(cell, self.cols)
+        col += d_col
+        row += d_row
+        if 0 <= col < self.cols and 0 <= row < self.rows:
+            return row * self.cols + col
+        return None
+
+    def jumps(self, distance: int) -> tuple:
+        """
+        Return, for every cell, the cells distance away along either axis that are inside the grid.
+        """
+        return tuple(
+            tuple(n for n in (self.step(cell, distance, 0), self.step(cell, 0, distance),
+                              self.step(cell, -distance, 0), self.step(cell, 0, -distance)) if n is not None)
+            for cell in range(len(self))
+        )
+
+    def occupy(self, cell: int) -> None:
+        self.load[cell] += 1
+        if self.load[cell] == 1:
+            self.free.discard(cell)
+
+    def vacate(self, cell: int) -> None:
+        self.load[cell] -= 1
+        if not self.load[cell]:
+            self.free.add(cell)
+
+    def add_food(self, cell: int) -> None:
+        self.food[cell] += 1
+        self.occupy(cell)
+
+    def remove_food(self, cell: int) -> None:
+        self.food[cell] -= 1
+        self.vacate(cell)
+
+
+class SnakeBody:
+    """
+    The cells of the snake from tail to head, mirrored into the grid's snake counts.
+
+    Appending a head and dropping the tail are both O(1), and so is asking
+    whether any segment covers a cell.
+    """
+
+    __slots__ = ("grid", "cells")
+
+    def __init__(self, grid: OccupancyGrid, head: int) -> None:
+        self.grid = grid
+        self.cells = deque()
+        self.push_head(head)
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.cells)
+
+    def __contains__(self, cell: int) -> bool:
+        return self.grid.snake[cell] > 0
+
+    @property
+    def head(self) -> int:
+        return self.cells[-1]
+
+    def push_head(self, cell: int) -> None:
+        self.cells.append(cell)
+        self.grid.snake[cell] += 1
+        self.grid.occupy(cell)
+
+    def pop_tail(self) -> int:
+        cell = self.cells.popleft()
+        self.grid.snake[cell] -= 1
+        self.grid.vacate(cell)
+        return cell
@@ -0,0 +1,91 @@
+"""
+One fixed-tick scheduler for every timed subsystem of the game.
+"""
+import heapq
+import itertools
+import math
+import time
+from typing import Callable, Optional
+
+Subsystem = Callable[[], Optional[int]]
+
+
+class GameLoop:
+    """
+    Runs every subsystem at its own rate inside a fixed simulation tick.
+
+    A subsystem is a callback that returns how many milliseconds of game time
+    should pass before it runs again, or None to stop. Game time only moves in
+    whole ticks, and each tick is matched against a monotonic clock: a tick
+    that fires late runs the ticks it missed (up to max_catch_up) and the next
+    one is aimed at the following tick boundary, so the callbacks never drift
+    against each other or against the wall clock.
+
+    Attributes:
+        tick_ms (int): The length of one simulation tick in milliseconds.
+        now_ms (int): The game time reached so far.
+    """
+
+    def __init__(self, tick_ms: int, clock: Callable[[], float] = time.monotonic, max_catch_up: int = 5) -> None:
+        self.tick_ms = tick_ms
+        self.now_ms = 0
+        self.max_catch_up = max_catch_up
+        self._clock = clock
+        self._start = clock()
+        self._queue = []
+        self._order = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def add(self, subsystem: Subsystem, delay_ms: int = 0) -> None:
+        """
+        Schedule a subsystem to first run delay_ms of game time from now.
+        """
+        heapq.heappush(self._queue, (self.now_ms + delay_ms, next(self._order), subsystem))
+
+    def run_tick(self) -> bool:
+        """
+        Advance game time by one tick and run every subsystem that is due.
+
+        A subsystem is rescheduled from the time it was due rather than from
+        the time it ran, so its own rate is kept exactly.
+
+        Returns:
+            bool: True if any subsystem ran.
+        """
+        self.now_ms += self.tick_ms
+        queue = self._queue
+        ran = False
+        while queue and queue[0][0] <= self.now_ms:
+            due, order, subsystem = heapq.heappop(queue)
+            ran = True
+            delay = subsystem()
+            if delay is not None:
+                heapq.heappush(queue, (due + max(delay, 0), order, subsystem))
+        return ran
+
+    def advance(self) -> bool:
+        """
+        Run all ticks the monotonic clock says are due.
+
+        Returns:
+            bool: True if any subsystem ran, i.e. the frame needs to be redrawn.
+        """
+        elapsed_ms = (self._clock() - self._start) * 1000
+        behind = int(elapsed_ms - self.now_ms) // self.tick_ms
+        if behind > self.max_catch_up:
+            # after a long stall, e.g. a dragged window, skip ahead instead of replaying it
+            self._start += (behind - self.max_catch_up) * self.tick_ms / 1000
+            behind = self.max_catch_up
+        ran = False
+        for _ in range(behind):
+            ran |= self.run_tick()
+        return ran
+
+    def next_delay_ms(self) -> int:
+        """
+        Return the wall-clock milliseconds until the next tick boundary.
+        """
+        elapsed_ms = (self._clock() - self._start) * 1000
+        return max(0, math.ceil(self.now_ms + self.tick_ms - elapsed_ms))
@@ -0,0 +1,86 @@
+"""
+Compact binary logs of a game's seed and inputs, and headless replay of them.
+
+A log is the 4-byte magic b"SNK1" and the 64-bit seed of the game's random
+generator, followed by one 5-byte record per input: the game time in
+milliseconds as a 32-bit int and the event code as a byte. All integers are
+little-endian. The last record is always "end".
+
+Inputs are stamped with the game loop's time, which only moves in whole
+ticks, so applying each one before the same tick on replay brings the game
+through exactly the same states.
+"""
+import struct
+from typing import BinaryIO, Callable, List, Tuple
+
+from snake_core.loop import GameLoop
+
+MAGIC = b"SNK1"
+HEADER = struct.Struct("<4sQ")
+RECORD = struct.Struct("<IB")
+EVENTS = ("start", "Up", "Down", "Left", "Right", "space", "end")
+CODES = {event: code for code, event in enumerate(EVENTS)}
+
+
+class Recorder:
+    """
+    Writes the seed and every input of one game to a binary log.
+    """
+
+    def __init__(self, stream: BinaryIO, seed: int) -> None:
+        if not 0 <= seed < 1 << 64:
+            raise ValueError(f"a log holds seeds from 0 to 2**64 - 1, got {seed}")
+        self.stream = stream
+        stream.write(HEADER.pack(MAGIC, seed))
+
+    def record(self, time_ms: int, event: str) -> None:
+        self.stream.write(RECORD.pack(time_ms, CODES[event]))
+
+    def close(self, time_ms: int) -> None:
+        """
+        Write the end record and close the stream.
+        """
+        self.record(time_ms, "end")
+        self.stream.close()
+
+
+def read_log(stream: BinaryIO) -> Tuple[int, List[Tuple[int, str]]]:
+    """
+    Read a log written by Recorder.
+
+    Returns:
+        tuple: The seed and the list of (time_ms, event) records, "end" included.
+    """
+    data = stream.read()
+    magic, seed = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("not a snake game log")
+    events = [(time_ms, EVENTS[code]) for time_ms, code in RECORD.iter_unpack(data[HEADER.size:])]
+    if not events or events[-1][1] != "end":
+        raise ValueError("the log is truncated")
+    return seed, events
+
+
+def replay(loop: GameLoop, events: List[Tuple[int, str]], apply: Callable[[str], None]) -> int:
+    """
+    Run a game loop tick by tick, as fast as possible, feeding it the logged inputs.
+
+    Every input is applied once the loop reaches its time, before the next
+    tick runs. Replay stops at the end record or when the loop runs out of
+    subsystems.
+
+    Returns:
+        int: The number of ticks run.
+    """
+    ticks = 0
+    pending = iter(events)
+    time_ms, event = next(pending)
+    while len(loop):
+        while time_ms <= loop.now_ms:
+            if event == "end":
+                return ticks
+            apply(event)
+            time_ms, event = next(pending)
+        loop.run_tick()
+        ticks += 1
+    return ticks
@@ -0,0 +1,87 @@
+"""
+Uniform-grid spatial hash of moving entities.
+"""
+from typing import Hashable, Iterator, Set
+
+from snake_core.grid import OccupancyGrid
+
+
+class SpatialHash:
+    """
+    Entities filed under square buckets of bucket x bucket grid cells.
+
+    Moving an entity only touches its old and new bucket, and asking what is
+    on a cell only walks that cell's bucket, so the cost follows how crowded
+    the neighbourhood is, not how many entities exist. Every entity counts
+    towards the grid's load on its cell.
+
+    Food is not filed here: it never needs telling apart on one cell, so the
+    grid's per-cell food counts already answer every food query in O(1).
+
+    Attributes:
+        grid (OccupancyGrid): The grid whose cell indices are used.
+        bucket (int): The width of a bucket in cells.
+        cells (dict): The cell of every entity.
+    """
+
+    __slots__ = ("grid", "bucket", "cols", "cells", "buckets")
+
+    def __init__(self, grid: OccupancyGrid, bucket: int = 4) -> None:
+        self.grid = grid
+        self.bucket = bucket
+        self.cols = -(-grid.cols // bucket)
+        self.cells = {}
+        self.buckets = [set() for _ in range(self.cols * -(-grid.rows // bucket))]
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def __contains__(self, entity: Hashable) -> bool:
+        return entity in self.cells
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self.cells)
+
+    def _bucket_of(self, cell: int) -> Set[Hashable]:
+        row, col = divmod(cell, self.grid.cols)
+        return self.buckets[row // self.bucket * self.cols + col // self.bucket]
+
+    def insert(self, entity: Hashable, cell: int) -> None:
+        self.cells[entity] = cell
+        self._bucket_of(cell).add(entity)
+        self.grid.occupy(cell)
+
+    def remove(self, entity: Hashable) -> int:
+        """
+        Drop an entity and return the cell it was on.
+        """
+        cell = self.cells.pop(entity)
+        self._bucket_of(cell).discard(entity)
+        self.grid.vacate(cell)
+        return cell
+
+    def move(self, entity: Hashable, cell: int) -> None:
+        old = self._bucket_of(self.cells[entity])
+        new = self._bucket_of(cell)
+        if old is not new:
+            old.discard(entity)
+            new.add(entity)
+        self.grid.vacate(self.cells[entity])
+        self.grid.occupy(cell)
+        self.cells[entity] = cell
+
+    def at(self, cell: int) -> Iterator[Hashable]:
+        """
+        Yield the entities on one cell.
+        """
+        cells = self.cells
+        for entity in self._bucket_of(cell):
+            if cells[entity] == cell:
+                yield entity
+
+    def occupied(self, cell: int) -> bool:
+        """
+        Return whether any entity is on a cell.
+        """
+        cells = self.cells
+        return any(cells[entity] == cell for entity in self._bucket_of(cell))
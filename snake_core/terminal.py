@@ -0,0 +1,176 @@
+"""
+ANSI terminal backend: a diffing renderer, raw key input and a frame loop.
+
+Nothing here needs Tk or curses, so the game can be played over SSH on a
+machine without a display. Key input uses termios and is POSIX only.
+"""
+import os
+import sys
+import time
+from typing import Callable, Dict, List, Optional, TextIO
+
+from snake_core.loop import GameLoop
+
+CSI = "\x1b["
+RESET = CSI + "0m"
+
+# escape sequences of the keys the game listens to, named like Tk names them
+KEYS = {"\x1b[A": "Up", "\x1b[B": "Down", "\x1b[C": "Right", "\x1b[D": "Left", " ": "space", "q": "q"}
+
+
+class TerminalRenderer:
+    """
+    Draws a grid of one-character cells, rewriting only what changed since the last frame.
+
+    A frame is a bytearray of cols * rows ASCII glyphs, row 0 being the bottom
+    row like on the play area. Each cell is drawn two columns wide so cells
+    come out roughly square. A frame is sent with a single write, and a frame
+    with no changes sends nothing.
+
+    Attributes:
+        cols (int): The number of columns of the grid.
+        rows (int): The number of rows of the grid.
+        styles (dict): The SGR parameters of each glyph, e.g. {"@": "1;31"}.
+    """
+
+    def __init__(self, cols: int, rows: int, styles: Optional[Dict[str, str]] = None, out: Optional[TextIO] = None) -> None:
+        self.cols = cols
+        self.rows = rows
+        self.styles = {ord(glyph): f"{CSI}{sgr}m" for glyph, sgr in (styles or {}).items()}
+        self.out = out or sys.stdout
+        self.frame = None
+        self.status = None
+        self.banner = None
+
+    def start(self, title: str = "") -> None:
+        """
+        Clear the terminal, hide the cursor and draw the border.
+        """
+        width = 2 * self.cols
+        parts = [CSI + "2J", CSI + "?25l", CSI + "1;1H", title]
+        parts.append(f"{CSI}3;1H+{'-' * width}+")
+        for y in range(4, 4 + self.rows):
+            parts.append(f"{CSI}{y};1H|{CSI}{y};{width + 2}H|")
+        parts.append(f"{CSI}{4 + self.rows};1H+{'-' * width}+")
+        self.out.write("".join(parts))
+        self.out.flush()
+        self.frame = bytearray(b" " * (self.cols * self.rows))
+        self.status = None
+
+    def draw(self, frame: bytearray, status: str = "", banner: Optional[str] = None) -> int:
+        """
+        Bring the terminal up to date with a frame and the status line.
+
+        Args:
+            frame (bytearray): One glyph per cell.
+            status (str): The line written above the play area.
+            banner (str, optional): A message written across the middle of the play area.
+
+        Returns:
+            int: The number of cells that were rewritten.
+        """
+        cols, styles = self.cols, self.styles
+        old = self.frame
+        parts = []
+        changed = 0
+        for row in range(self.rows):
+            start = row * cols
+            line = frame[start:start + cols]
+            if line == old[start:start + cols]:
+                continue
+            y = 4 + self.rows - 1 - row
+            cursor = -1
+            for col, glyph in enumerate(line):
+                if glyph == old[start + col]:
+                    continue
+                if cursor != col:
+                    parts.append(f"{CSI}{y};{2 + 2 * col}H")
+                style = styles.get(glyph)
+                parts.append(f"{style}{chr(glyph)} {RESET}" if style else f"{chr(glyph)} ")
+                cursor = col + 1
+                changed += 1
+            old[start:start + cols] = line
+        if status != self.status:
+            parts.append(f"{CSI}2;1H{CSI}2K{status}")
+            self.status = status
+        if banner and banner != self.banner:
+            y = 4 + self.rows // 2
+            parts.append(f"{CSI}{y};{max(2, self.cols + 2 - len(banner) // 2)}H{CSI}1m{banner}{RESET}")
+        self.banner = banner
+        if parts:
+            parts.append(f"{CSI}{5 + self.rows};1H")
+            self.out.write("".join(parts))
+            self.out.flush()
+        return changed
+
+    def close(self) -> None:
+        """
+        Show the cursor again and leave it below the play area.
+        """
+        self.out.write(f"{RESET}{CSI}?25h{CSI}{5 + self.rows};1H\n")
+        self.out.flush()
+
+
+class KeyReader:
+    """
+    Reads key presses without waiting for Enter, for use in a with statement.
+
+    The terminal is put in cbreak mode on entry and restored on exit.
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None) -> None:
+        self.fd = (stream or sys.stdin).fileno()
+        self.saved = None
+
+    def __enter__(self) -> "KeyReader":
+        import termios
+        import tty
+
+        self.saved = termios.tcgetattr(self.fd)
+        tty.setcbreak(self.fd)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        import termios
+
+        termios.tcsetattr(self.fd, termios.TCSADRAIN, self.saved)
+
+    def read(self, timeout: float = 0) -> List[str]:
+        """
+        Return the names of the keys pressed since the last call, waiting up to timeout seconds for one.
+        """
+        import select
+
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return []
+        data = os.read(self.fd, 64).decode(errors="ignore")
+        keys = []
+        i = 0
+        while i < len(data):
+            size = 3 if data.startswith(CSI, i) else 1
+            key = KEYS.get(data[i:i + size])
+            if key:
+                keys.append(key)
+            i += size
+        return keys
+
+
+def run(loop: GameLoop, render: Callable[[], None], on_key: Callable[[str], bool], keys: KeyReader, fps: int = 60) -> None:
+    """
+    Drive a game loop from the terminal until it runs out of subsystems or on_key returns False.
+
+    Keys are handled as they come in, the loop advances whenever a tick is
+    due, and render is called at most fps times a second. The renderer only
+    writes what changed, so idle frames cost nothing.
+    """
+    frame_s = 1 / fps
+    next_frame = time.monotonic()
+    while len(loop):
+        for key in keys.read(min(loop.next_delay_ms() / 1000, max(0.0, next_frame - time.monotonic()))):
+            if not on_key(key):
+                return
+        loop.advance()
+        now = time.monotonic()
+        if now >= next_frame:
+            render()
+            next_frame = max(next_frame + frame_s, now)
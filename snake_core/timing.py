@@ -0,0 +1,143 @@
+"""
+Latency and timer jitter of the game's callbacks, with an export to the Chrome trace format.
+"""
+import bisect
+import collections
+import functools
+import json
+import time
+from typing import Callable, Optional, TextIO
+
+# bucket upper bounds in seconds, 1 us to about 1 s in powers of two
+BOUNDS = tuple(2 ** i / 1e6 for i in range(21))
+
+
+class Histogram:
+    """
+    Counts of samples in power-of-two buckets, cheap enough to feed every frame.
+
+    Attributes:
+        counts (list): The number of samples per bucket of BOUNDS, plus one for anything larger.
+        total (float): The sum of all samples in seconds.
+        worst (float): The largest sample in seconds.
+    """
+
+    __slots__ = ("counts", "total", "worst")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(BOUNDS) + 1)
+        self.total = 0.0
+        self.worst = 0.0
+
+    def __len__(self) -> int:
+        return sum(self.counts)
+
+    def add(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(BOUNDS, seconds)] += 1
+        self.total += seconds
+        self.worst = max(self.worst, seconds)
+
+    def percentile(self, p: float) -> float:
+        """
+        Return the upper bound of the bucket that holds the p-th percentile, in seconds.
+
+        The bound is at most a factor of two above the real value, and the
+        overflow bucket reports the largest sample.
+        """
+        rank = p / 100 * len(self)
+        seen = 0
+        for bound, count in zip(BOUNDS, self.counts):
+            seen += count
+            if count and seen >= rank:
+                return min(bound, self.worst)
+        return self.worst
+
+
+class Profiler:
+    """
+    Times every call of the wrapped callbacks against the interval they asked for.
+
+    A wrapped callback returns the delay in milliseconds before it wants to
+    run again, like the subsystems of a GameLoop, and the wall-clock time
+    between the start of that call and the start of the next one is compared
+    with it. The difference is the timer's jitter: a drifting or stalled
+    timer shows up there, a slow callback shows up in its latency.
+
+    Attributes:
+        latency (dict): Name -> Histogram of how long each call took.
+        jitter (dict): Name -> Histogram of how far each interval was off its target.
+        events (list): The Chrome trace events of every call, when tracing.
+    """
+
+    def __init__(self, trace: bool = False, clock: Callable[[], float] = time.perf_counter) -> None:
+        self.latency = collections.defaultdict(Histogram)
+        self.jitter = collections.defaultdict(Histogram)
+        self.events = [] if trace else None
+        self._clock = clock
+        self._origin = clock()
+        self._expected = {}  # name -> (start of the last call, the interval it asked for)
+        self._calls = {}
+        self._rate_mark = (self._origin, {})
+
+    def wrap(self, callback: Callable[..., Optional[int]], name: str = None) -> Callable[..., Optional[int]]:
+        """
+        Return callback timed under name, the callback's own name by default.
+        """
+        name = name or callback.__name__
+
+        @functools.wraps(callback)
+        def timed(*args):
+            start = self._clock()
+            delay = callback(*args)
+            self.record(name, start, self._clock(), delay)
+            return delay
+        return timed
+
+    def record(self, name: str, start: float, end: float, delay: Optional[int] = None) -> None:
+        """
+        Record one call of name that ran from start to end and asked to run again in delay milliseconds.
+        """
+        self.latency[name].add(end - start)
+        self._calls[name] = self._calls.get(name, 0) + 1
+        args = {}
+        last = self._expected.pop(name, None)
+        if last is not None:
+            interval = start - last[0]
+            self.jitter[name].add(abs(interval - last[1]))
+            args = {"target_ms": last[1] * 1000, "interval_ms": round(interval * 1000, 3)}
+        if delay is not None:
+            self._expected[name] = (start, delay / 1000)
+        if self.events is not None:
+            self.events.append({"name": name, "ph": "X", "pid": 1, "tid": 1, "args": args,
+                                "ts": round((start - self._origin) * 1e6, 1), "dur": round((end - start) * 1e6, 1)})
+
+    def rate(self, name: str) -> float:
+        """
+        Return the calls per second of name since the previous rate() call.
+        """
+        now, calls = self._clock(), dict(self._calls)
+        since, before = self._rate_mark
+        self._rate_mark = (now, calls)
+        return (calls.get(name, 0) - before.get(name, 0)) / max(now - since, 1e-9)
+
+    def report(self) -> str:
+        """
+        Return a table of the latency and jitter percentiles of every callback, in milliseconds.
+        """
+        lines = [f"{'callback':<28}{'calls':>8}{'mean':>9}{'p50':>9}{'p95':>9}{'max':>9}"
+                 f"{'jitter p50':>12}{'p95':>9}{'max':>9}"]
+        for name, latency in list(self.latency.items()):
+            if not len(latency):
+                continue
+            jitter = self.jitter[name]
+            columns = (latency.total / len(latency), latency.percentile(50), latency.percentile(95), latency.worst,
+                       jitter.percentile(50), jitter.percentile(95), jitter.worst)
+            lines.append(f"{name:<28}{len(latency):>8}" +
+                         "".join(f"{seconds * 1000:>{12 if i == 4 else 9}.3f}" for i, seconds in enumerate(columns)))
+        return "\n".join(lines)
+
+    def write_trace(self, stream: TextIO) -> None:
+        """
+        Write the recorded calls as a Chrome trace, which chrome://tracing and Perfetto open.
+        """
+        json.dump({"traceEvents": self.events or [], "displayTimeUnit": "ms"}, stream)
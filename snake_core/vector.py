@@ -0,0 +1,287 @@
+"""
+Many headless snake games stepped at once on NumPy arrays.
+
+The rules are those of the turtle game: the snake moves one cell per step
+unless the border is in the way, eating food numbered k grows it by k segments
+and slows it down for k steps, monsters step towards the head along the nearest
+axis, a monster stepping onto or next to the body counts a contact, and a
+monster on the head ends the game. The game is won once all food is eaten and the body has
+grown to its full length.
+
+Game time is counted in snake steps of TIMER_SNAKE milliseconds. The monster
+timer of the turtle game fires on average every 350 ms and moves 0 to 3 of the
+4 monsters, so here every monster moves with probability MONSTER_MOVE_RATE per
+TIMER_SNAKE of game time, twice that while the snake is digesting. Food does
+not wander.
+
+Every game is a row: heads are an (N,) array, bodies an (N, RING) ring
+buffer, and food and snake occupancy (N, cells) arrays, so a step is a fixed
+number of whole-array operations whatever N is.
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+
+GRID_SIZE = 25
+MIN_SIZE = 4  # the smallest grid with room for all the food off the start cell
+START_SIZE = 5
+FOOD_NUMBER = 5
+MONSTER_NUMBER = 4
+MAX_LENGTH = 1 + START_SIZE + FOOD_NUMBER * (FOOD_NUMBER + 1) // 2
+RING = MAX_LENGTH + 1  # the new head is written before the tail is dropped
+MONSTER_MOVE_RATE = 0.2
+
+REWARD_CONTACT = -1.0
+REWARD_WIN = 10.0
+REWARD_LOSE = -10.0
+
+# column and row offsets of the headings right, up, left, down
+D_COL = np.array([1, 0, -1, 0])
+D_ROW = np.array([0, 1, 0, -1])
+
+OBSERVATION_SIZE = 2 * (1 + MONSTER_NUMBER + FOOD_NUMBER) + 2
+EMPTY, BODY, HEAD, MONSTER = 0, 1, 2, 3  # board codes, food k is MONSTER + k
+
+
+class VectorSnake:
+    """
+    N independent snake games advanced by one step per call.
+
+    Finished games are reset in place at the start of the next step, so the
+    batch never shrinks.
+
+    Attributes:
+        count (int): The number of games N.
+        size (int): The width and height of the grid in cells.
+        head (np.ndarray): (N,) cell of every head.
+        body (np.ndarray): (N, RING) ring buffer of body cells, the head included.
+        tail (np.ndarray): (N,) ring index of the oldest body cell.
+        length (np.ndarray): (N,) number of body cells.
+        target (np.ndarray): (N,) number of segments the snake is growing to.
+        digest (np.ndarray): (N,) steps the snake is still slowed down for.
+        snake (np.ndarray): (N, cells) body cells per cell.
+        food (np.ndarray): (N, cells) number of the food on a cell, 0 for none.
+        food_cells (np.ndarray): (N, FOOD_NUMBER) cell of food k in column k-1, -1 once eaten.
+        food_left (np.ndarray): (N,) food items not yet eaten.
+        monsters (np.ndarray): (N, MONSTER_NUMBER) cell of every monster.
+        contacts (np.ndarray): (N,) contacts so far.
+        steps (np.ndarray): (N,) steps taken in the current game.
+        done (np.ndarray): (N,) games that ended on the last step.
+    """
+
+    def __init__(self, count: int, seed: Optional[int] = None, size: int = GRID_SIZE) -> None:
+        if size < MIN_SIZE:
+            raise ValueError(f"the grid must be at least {MIN_SIZE} cells wide, got {size}")
+        self.count = count
+        self.size = size
+        self.rng = np.random.default_rng(seed)
+        cells = size * size
+        self.rows = np.arange(count)
+        self.head = np.zeros(count, dtype=np.intp)
+        self.body = np.zeros((count, RING), dtype=np.intp)
+        self.tail = np.zeros(count, dtype=np.intp)
+        self.length = np.zeros(count, dtype=np.intp)
+        self.target = np.zeros(count, dtype=np.intp)
+        self.digest = np.zeros(count, dtype=np.intp)
+        self.snake = np.zeros((count, cells), dtype=np.uint8)
+        self.food = np.zeros((count, cells), dtype=np.uint8)
+        self.food_cells = np.zeros((count, FOOD_NUMBER), dtype=np.intp)
+        self.food_left = np.zeros(count, dtype=np.intp)
+        self.monsters = np.zeros((count, MONSTER_NUMBER), dtype=np.intp)
+        self.contacts = np.zeros(count, dtype=np.intp)
+        self.steps = np.zeros(count, dtype=np.intp)
+        self.done = np.zeros(count, dtype=bool)
+        centre = size // 2
+        inner = (np.arange(1, size)[:, None] * size + np.arange(1, size)).ravel()
+        self._food_spots = inner[inner != (centre + 1) * size + centre]
+        # the neighbour of every cell in each heading, the cell itself standing in for one off the grid
+        cell = np.arange(cells)
+        col, row = cell % size, cell // size
+        self._beside = [
+            np.where((col + d_col >= 0) & (col + d_col < size) & (row + d_row >= 0) & (row + d_row < size),
+                     cell + d_row * size + d_col, cell)
+            for d_col, d_row in zip(D_COL, D_ROW)
+        ]
+        self.reset()
+
+    def reset(self, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Start new games in the given rows, all of them by default.
+
+        Returns:
+            np.ndarray: The observation of every game.
+        """
+        self._start(self.rows if rows is None else rows)
+        return self.observe()
+
+    def _start(self, rows: np.ndarray) -> None:
+        k = len(rows)
+        size = self.size
+        centre = size // 2
+        # the head starts one row above the centre, like the turtle at (0, 0)
+        start = (centre + 1) * size + centre
+        self.head[rows] = start
+        self.body[rows, 0] = start
+        self.tail[rows] = 0
+        self.length[rows] = 1
+        self.target[rows] = START_SIZE + 1
+        self.digest[rows] = 0
+        self.snake[rows] = 0
+        self.snake[rows, start] = 1
+        # food k on distinct cells away from the bottom row, the left column and the head
+        inner = self._food_spots
+        keys = self.rng.random((k, len(inner)))
+        picks = inner[np.argpartition(keys, FOOD_NUMBER, axis=1)[:, :FOOD_NUMBER]]
+        self.food[rows] = 0
+        self.food[rows[:, None], picks] = np.arange(1, FOOD_NUMBER + 1, dtype=np.uint8)
+        self.food_cells[rows] = picks
+        self.food_left[rows] = FOOD_NUMBER
+        # monsters 6 to 9 cells from the centre along both axes, closer on grids too small for that
+        farthest = min(9, size - 1 - centre)
+        closest = min(6, farthest)
+        offsets = (self.rng.integers(closest, farthest + 1, (k, MONSTER_NUMBER, 2))
+                   * self.rng.choice([-1, 1], (k, MONSTER_NUMBER, 2)))
+        self.monsters[rows] = (centre + offsets[..., 1]) * size + centre + offsets[..., 0]
+        self.contacts[rows] = 0
+        self.steps[rows] = 0
+
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Advance every game by one snake step.
+
+        Args:
+            actions (np.ndarray): (N,) heading of every snake, 0 to 3 for right,
+                up, left and down.
+
+        Returns:
+            tuple: The (N, OBSERVATION_SIZE) observations, the (N,) float32 rewards and the
+            (N,) boolean done flags. A done game keeps its final state until the
+            next step starts it again.
+        """
+        if self.done.any():
+            self._start(np.flatnonzero(self.done))
+        rows = self.rows
+        size = self.size
+        reward = np.zeros(self.count, dtype=np.float32)
+
+        # the snake steps unless it would leave the grid
+        col, row = self.head % size + D_COL[actions], self.head // size + D_ROW[actions]
+        moving = (col >= 0) & (col < size) & (row >= 0) & (row < size)
+        moved = rows[moving]
+        new_head = row[moving] * size + col[moving]
+        self.head[moved] = new_head
+        self.body[moved, (self.tail[moved] + self.length[moved]) % RING] = new_head
+        self.snake[moved, new_head] += 1
+        self.length[moved] += 1
+
+        # consume_food
+        eaten = self.food[moved, new_head].astype(np.intp)
+        eating = eaten > 0
+        eater = moved[eating]
+        self.food[eater, new_head[eating]] = 0
+        self.target[eater] += eaten[eating]
+        self.digest[eater] += eaten[eating]
+        self.food_cells[eater, eaten[eating] - 1] = -1
+        self.food_left[eater] -= 1
+        reward[eater] += eaten[eating]
+
+        # shifting or extending the tail
+        shrinking = moved[self.length[moved] > self.target[moved]]
+        self.snake[shrinking, self.body[shrinking, self.tail[shrinking]]] -= 1
+        self.tail[shrinking] = (self.tail[shrinking] + 1) % RING
+        self.length[shrinking] -= 1
+
+        # a digesting snake is slowed to half speed, so the monsters get twice the time
+        slow = self.digest > 0
+        self.digest[slow] -= 1
+        rate = np.where(slow, 2 * MONSTER_MOVE_RATE, MONSTER_MOVE_RATE)
+        self._move_monsters(self.rng.random((self.count, MONSTER_NUMBER)) < rate[:, None], reward)
+
+        lost = (self.monsters == self.head[:, None]).any(axis=1)
+        won = (self.food_left == 0) & (self.length == MAX_LENGTH) & ~lost
+        reward[lost] += REWARD_LOSE
+        reward[won] += REWARD_WIN
+        self.done = lost | won
+        self.steps += 1
+        return self.observe(), reward, self.done
+
+    def _move_monsters(self, moving: np.ndarray, reward: np.ndarray) -> None:
+        """
+        Step the chosen monsters towards the head, counting contacts with the body.
+
+        The turtle game's monsters walk around the body and touch it from a
+        neighbouring cell, so a monster that ends up on or next to the body counts.
+
+        The heading is the angle to the head snapped to a multiple of 90
+        degrees, with the 45-degree sectors rounded the way the turtle game
+        rounds them.
+        """
+        size = self.size
+        game, which = np.nonzero(moving)
+        cell = self.monsters[game, which]
+        head = self.head[game]
+        m_col, m_row = cell % size, cell // size
+        d_col, d_row = head % size - m_col, head // size - m_row
+        # towards() snapped to 90 degrees: a 45-degree tie goes counterclockwise
+        horizontal = (np.abs(d_col) > np.abs(d_row)) | ((np.abs(d_col) == np.abs(d_row)) & (d_col * d_row <= 0))
+        heading = np.where(horizontal, np.where(d_col >= 0, 0, 2), np.where(d_row > 0, 1, 3))
+        col, row = m_col + D_COL[heading], m_row + D_ROW[heading]
+        inside = (col >= 0) & (col < size) & (row >= 0) & (row < size)
+        game, which = game[inside], which[inside]
+        cell = row[inside] * size + col[inside]
+        self.monsters[game, which] = cell
+        snake = self.snake.reshape(-1)
+        base = game * (size * size)
+        touched = snake[base + cell] > 0
+        for beside in self._beside:
+            touched |= snake[base + beside[cell]] > 0
+        np.add.at(self.contacts, game[touched], 1)
+        np.add.at(reward, game[touched], REWARD_CONTACT)
+
+    def observe(self) -> np.ndarray:
+        """
+        Return the positions of every game as an (N, OBSERVATION_SIZE) int16 array.
+
+        A row holds the head, the monsters and food 1 to FOOD_NUMBER as column
+        and row pairs, -1 for food already eaten, then the body length and the
+        steps left to digest. Use boards() for the whole grid.
+        """
+        size = self.size
+        cells = np.concatenate((self.head[:, None], self.monsters, self.food_cells), axis=1)
+        obs = np.empty((self.count, OBSERVATION_SIZE), dtype=np.int16)
+        obs[:, 0:-2:2] = np.where(cells >= 0, cells % size, -1)
+        obs[:, 1:-2:2] = np.where(cells >= 0, cells // size, -1)
+        obs[:, -2] = self.length
+        obs[:, -1] = self.digest
+        return obs
+
+    def boards(self) -> np.ndarray:
+        """
+        Return every game as an (N, cells) uint8 board.
+
+        Cells hold EMPTY, BODY, HEAD, MONSTER or MONSTER + k for food k, a
+        monster covering whatever is under it.
+        """
+        board = np.where(self.food > 0, self.food + MONSTER, EMPTY).astype(np.uint8)
+        board[self.snake > 0] = BODY
+        board[self.rows, self.head] = HEAD
+        board[self.rows[:, None], self.monsters] = MONSTER
+        return board
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 4096
+    steps = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    env = VectorSnake(total, seed=0)
+    policy = np.random.default_rng(1)
+    start = time.perf_counter()
+    finished = 0
+    for _ in range(steps):
+        _, _, done = env.step(policy.integers(0, 4, total))
+        finished += int(done.sum())
+    elapsed = time.perf_counter() - start
+    print(f"{total} games x {steps} steps in {elapsed:.2f}s "
+          f"({total * steps / elapsed:,.0f} steps/s), {finished} games finished")
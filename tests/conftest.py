@@ -0,0 +1,31 @@
+"""
+Shared fixtures. The repository root goes on sys.path, as the games put it there themselves.
+"""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, ROOT)
+
+from benchmarks.harness import load_script  # noqa: E402
+from puzzle_core.oracle import build, open_oracle  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def text_game():
+    """
+    The text puzzle of assignment1, imported without running its main loop.
+    """
+    return load_script("puzzle_text_game", "assignment1/(1)A1_SSE_123090043.py")
+
+
+@pytest.fixture(scope="session")
+def oracle(tmp_path_factory):
+    """
+    A 3x3 oracle built in a temporary directory, leaving the user's cache alone.
+    """
+    path = str(tmp_path_factory.mktemp("oracle") / "oracle3x3.bin")
+    build(path)
+    return open_oracle(path)
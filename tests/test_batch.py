@@ -0,0 +1,50 @@
+"""
+Vectorised generation, parity and Manhattan distances against the scalar versions.
+"""
+import numpy as np
+import pytest
+
+from puzzle_core.batch import batch_parity, generate_batch, manhattan_distances, manhattan_summary
+from puzzle_core.generator import is_solvable, is_solved, permutation_parity
+
+
+def manhattan(board, n):
+    return sum(abs((t - 1) // n - i // n) + abs((t - 1) % n - i % n) for i, t in enumerate(board) if t)
+
+
+@pytest.mark.parametrize("n", range(2, 17))
+def test_every_generated_row_is_solvable(n):
+    boards = generate_batch(200, n, seed=n)
+    assert boards.shape == (200, n * n) and boards.dtype == np.uint8
+    for row in boards.tolist():
+        assert sorted(row) == list(range(n * n))
+        assert is_solvable(row, n) and not is_solved(row)
+
+
+def test_2x2_batches_repair_solved_rows():
+    # one shuffle in 24 is the goal itself, so hundreds of these rows need the repair
+    assert not any(is_solved(row) for row in generate_batch(5000, 2, seed=0).tolist())
+
+
+def test_batch_parity_matches_cycle_parity():
+    rng = np.random.default_rng(0)
+    boards = rng.permuted(np.broadcast_to(np.arange(25, dtype=np.uint8), (300, 25)), axis=1)
+    assert batch_parity(boards).tolist() == [permutation_parity(row) for row in boards.tolist()]
+
+
+@pytest.mark.parametrize("n", [3, 4, 7])
+def test_manhattan_summary_matches_scalar(n):
+    boards = generate_batch(500, n, seed=1)
+    scalar = [manhattan(row, n) for row in boards.tolist()]
+    assert manhattan_distances(boards, n).tolist() == scalar
+    summary = manhattan_summary(boards, n)
+    assert summary["count"] == 500
+    assert summary["min"] == min(scalar) and summary["max"] == max(scalar)
+    assert summary["mean"] == pytest.approx(sum(scalar) / len(scalar))
+    assert summary["percentiles"][50] == pytest.approx(float(np.median(scalar)))
+    assert summary["histogram"] == {d: scalar.count(d) for d in set(scalar)}
+
+
+def test_wide_batches_are_rejected():
+    with pytest.raises(ValueError):
+        generate_batch(1, 17)
@@ -0,0 +1,64 @@
+"""
+One input line through a batch worker, with the tables built in a temporary directory.
+"""
+import json
+import sys
+
+import pytest
+
+from puzzle_core import batch_solve
+from puzzle_core.generator import is_solved
+
+BOARD = "[1, 2, 3, 4, 5, 6, 0, 7, 8]"
+
+
+def replay(board, moves):
+    board = list(board)
+    blank = board.index(0)
+    for target in moves:
+        board[blank], board[target] = board[target], 0
+        blank = target
+    return board
+
+
+@pytest.fixture
+def worker(tmp_path, monkeypatch):
+    monkeypatch.setattr(batch_solve, "_databases", {})
+    batch_solve._start_worker(str(tmp_path), None)
+    yield
+    batch_solve._start_worker(None, None)
+
+
+def test_small_boards_are_solved_optimally(worker):
+    record = batch_solve.solve_line((1, BOARD))
+    assert record["optimal"] and record["length"] == 2
+    assert is_solved(replay(record["board"], record["moves"]))
+
+
+def test_wide_boards_are_solved_within_a_budget(worker, monkeypatch):
+    monkeypatch.setattr(batch_solve, "BOUNDED_WIDTH", 3)
+    record = batch_solve.solve_line((1, "8 7 6 5 4 3 2 1 0"))
+    assert not record["optimal"]
+    assert is_solved(replay(record["board"], record["moves"]))
+
+
+def test_bad_lines_become_errors(worker):
+    assert "error" in batch_solve.solve_line((4, "[1, 2, 3, 4, 5, 6, 8, 7, 0]"))
+    assert "error" in batch_solve.solve_line((5, "1 2 3"))
+
+
+@pytest.mark.parametrize("line", ["[1, 2, null, 4]", "[[1, 2], [3, 0]]", "[1, 2, 4.5, 0]", "[true, 2, 3, 0]",
+                                  "1 2 x 0", "[1, 2,"])
+def test_malformed_lines_become_errors(worker, line):
+    with pytest.raises(ValueError):
+        batch_solve.parse_board(line)
+    assert "error" in batch_solve.solve_line((1, line))
+
+
+def test_bad_line_does_not_stop_the_run(tmp_path, monkeypatch, capsys):
+    boards = tmp_path / "boards.txt"
+    boards.write_text(f"[1, 2, null, 4]\n{BOARD}\n", encoding="utf-8")
+    monkeypatch.setattr(sys, "argv", ["batch_solve", str(boards), "--workers", "1", "--tables", str(tmp_path)])
+    assert batch_solve.main() == 1
+    records = sorted((json.loads(line) for line in capsys.readouterr().out.splitlines()), key=lambda r: r["line"])
+    assert "error" in records[0] and records[1]["length"] == 2
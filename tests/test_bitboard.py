@@ -0,0 +1,61 @@
+"""
+Packed boards against the flat lists they encode.
+"""
+import random
+
+import pytest
+
+from puzzle_core.bitboard import (GOALS, blank_index, decode, distances, encode, move_table, random_state, slide,
+                                  successors)
+from puzzle_core.solver import goal_state
+
+
+@pytest.mark.parametrize("n", [2, 3, 4])
+def test_encode_decode_round_trip(n):
+    rng = random.Random(n)
+    for _ in range(100):
+        state = random_state(n, rng)
+        assert encode(decode(state, n)) == state
+    assert decode(GOALS[n], n) == list(goal_state(n))
+
+
+@pytest.mark.parametrize("n", [2, 3, 4])
+def test_slide_matches_list_and_undoes(n):
+    rng = random.Random(n)
+    state = random_state(n, rng)
+    blank = blank_index(state, n)
+    for _ in range(300):
+        target, target_shift, blank_shift = rng.choice(move_table(n)[blank])
+        board = decode(state, n)
+        board[blank], board[target] = board[target], 0
+        moved = slide(state, target_shift, blank_shift)
+        assert decode(moved, n) == board
+        # sliding the tile back restores the board
+        assert slide(moved, blank_shift, target_shift) == state
+        state, blank = moved, target
+        assert blank_index(state, n) == blank
+
+
+def test_successors_are_the_legal_moves():
+    state = encode([1, 2, 3, 4, 0, 5, 6, 7, 8])
+    children = {target: child for child, target in successors(state, 4, 3)}
+    assert sorted(children) == [1, 3, 5, 7]
+    assert decode(children[5], 3) == [1, 2, 3, 4, 5, 0, 6, 7, 8]
+
+
+def test_move_table_does_not_wrap_rows():
+    assert [target for target, _, _ in move_table(3)[2]] == [5, 1]
+    assert [target for target, _, _ in move_table(4)[4]] == [0, 8, 5]
+
+
+def test_distances_cover_the_solvable_boards():
+    table = distances(2)
+    assert len(table) == 12
+    assert table[GOALS[2]] == 0
+    assert max(table.values()) == 6
+    assert len(distances(3)) == 181440
+
+
+def test_too_many_cells_are_rejected():
+    with pytest.raises(ValueError):
+        encode(range(25))
@@ -0,0 +1,78 @@
+"""
+The running solved count of PuzzleBoard, and MeteredBoard's running estimate, against a full recount.
+"""
+import random
+
+import pytest
+
+from puzzle_core.board import MeteredBoard, PuzzleBoard
+from puzzle_core.generator import generate_new_puzzle
+from puzzle_core.solver import LINE_CACHE_SIZE, neighbour_table, solve
+
+
+def recount(board):
+    size = len(board)
+    return sum(1 for i, tile in enumerate(board) if tile == (i + 1) % size)
+
+
+@pytest.mark.parametrize("n", [2, 3, 4, 7])
+def test_correct_count_follows_random_walk(n):
+    rng = random.Random(n)
+    board = PuzzleBoard(n, generate_new_puzzle(n, rng))
+    steps = neighbour_table(n)
+    for _ in range(500):
+        board.move_empty(rng.choice(steps[board.empty]))
+        assert board.correct == recount(board)
+        assert board.is_solved() == (board.tolist() == [*range(1, n * n), 0])
+
+
+def test_solution_solves_board():
+    puzzle = generate_new_puzzle(3, random.Random(1))
+    board = PuzzleBoard(3, puzzle)
+    assert not board.is_solved()
+    board.apply(solve(puzzle))
+    assert board.is_solved()
+    assert board.correct == 9
+
+
+def test_default_board_is_solved():
+    assert PuzzleBoard(4).is_solved()
+
+
+def test_can_move_does_not_wrap_rows():
+    board = PuzzleBoard(3, [1, 2, 0, 3, 4, 5, 6, 7, 8])
+    assert board.can_move(1) and board.can_move(5)
+    assert not board.can_move(3)  # first cell of the next row
+    assert not board.can_move(0) and not board.can_move(-1)
+
+
+def test_wrong_length_is_rejected():
+    with pytest.raises(ValueError):
+        PuzzleBoard(3, [1, 2, 3, 0])
+
+
+def test_copy_is_independent():
+    board = PuzzleBoard(3, [1, 2, 3, 4, 5, 6, 7, 0, 8])
+    twin = board.copy()
+    board.move_empty(7)
+    assert twin.tolist() == [1, 2, 3, 4, 5, 6, 7, 0, 8]
+    assert twin.correct == recount(twin) and twin.empty == 7
+
+
+@pytest.mark.parametrize("n", [3, 4, 10])
+def test_estimate_follows_random_walk(n):
+    rng = random.Random(n)
+    board = MeteredBoard(n, generate_new_puzzle(n, rng))
+    steps = neighbour_table(n)
+    for _ in range(2000):
+        board.move_empty(rng.choice(steps[board.empty]))
+        assert board.estimate == board.heuristic.estimate(board.cells)
+    assert board.heuristic.row_conflict.cache_info().currsize <= LINE_CACHE_SIZE
+    assert board.copy().estimate == board.estimate
+
+
+def test_estimate_is_zero_when_solved():
+    board = MeteredBoard(3, [1, 2, 3, 4, 5, 6, 7, 0, 8])
+    assert board.estimate == 1
+    board.move_empty(8)
+    assert board.estimate == 0 and board.is_solved()
@@ -0,0 +1,54 @@
+"""
+Boards of a chosen difficulty, checked against the oracle's exact distances.
+"""
+import argparse
+import random
+
+import pytest
+
+from puzzle_core import difficulty, pdb
+from puzzle_core.difficulty import LONGEST_3X3, LayerTable, generate_by_difficulty, parse_lengths, verified_puzzle
+
+
+@pytest.fixture
+def layers(oracle, monkeypatch):
+    table = LayerTable(oracle)
+    monkeypatch.setattr(difficulty, "_LAYERS", table)
+    return table
+
+
+@pytest.mark.parametrize("low, high", [(1, 1), (5, 5), (20, 22), (30, LONGEST_3X3)])
+def test_3x3_draws_fall_in_range(oracle, layers, low, high):
+    rng = random.Random(low)
+    for _ in range(50):
+        assert low <= oracle.distance(generate_by_difficulty(3, low, high, rng)) <= high
+
+
+def test_longest_3x3_matches_the_oracle(layers):
+    assert layers.longest == LONGEST_3X3
+    assert layers.count(0, LONGEST_3X3) == 181440
+    with pytest.raises(ValueError):
+        generate_by_difficulty(3, LONGEST_3X3 + 1)
+
+
+def test_verified_boards_fall_in_range(tmp_path, monkeypatch, oracle):
+    monkeypatch.setattr(pdb, "CACHE", str(tmp_path))
+    monkeypatch.setattr(pdb, "_DATABASES", {})
+    rng = random.Random(0)
+    for _ in range(10):
+        assert 10 <= oracle.distance(verified_puzzle(3, 10, 12, rng)) <= 12
+
+
+def test_node_budget_overrun_raises(tmp_path, monkeypatch):
+    monkeypatch.setattr(pdb, "CACHE", str(tmp_path))
+    monkeypatch.setattr(pdb, "_DATABASES", {})
+    with pytest.raises(RuntimeError):
+        verified_puzzle(3, 24, 26, random.Random(0), max_nodes=5)
+
+
+def test_parse_lengths():
+    assert parse_lengths("7") == (7, 7)
+    assert parse_lengths("20-22") == (20, 22)
+    for text in ("0", "5-3", "0-4"):
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_lengths(text)
@@ -0,0 +1,73 @@
+"""
+Solvability and generation against the textbook inversion count.
+"""
+import collections
+import itertools
+import random
+
+import pytest
+
+from puzzle_core.batch import shuffled_board
+from puzzle_core.generator import (NUMPY_WIDTH, board_width, generate_new_puzzle, is_solvable, is_solved,
+                                   permutation_parity)
+
+
+def inversions(values):
+    return sum(1 for i, j in itertools.combinations(range(len(values)), 2) if values[i] > values[j])
+
+
+def textbook_solvable(puzzle, n):
+    tiles = [tile for tile in puzzle if tile]
+    count = inversions(tiles)
+    if n % 2:
+        return count % 2 == 0
+    return (count + n - 1 - puzzle.index(0) // n) % 2 == 0
+
+
+@pytest.mark.parametrize("n", [2, 3, 4, 5])
+def test_is_solvable_matches_inversion_count(n):
+    rng = random.Random(n)
+    for _ in range(300):
+        puzzle = list(range(n * n))
+        rng.shuffle(puzzle)
+        assert permutation_parity(puzzle) == inversions(puzzle) % 2
+        assert is_solvable(puzzle, n) == textbook_solvable(puzzle, n)
+
+
+def test_every_2x2_board():
+    # a 2x2 board has 12 solvable arrangements out of 24
+    boards = [list(p) for p in itertools.permutations(range(4))]
+    assert sum(is_solvable(board, 2) for board in boards) == 12
+
+
+@pytest.mark.parametrize("n", [2, 3, 4, 10, 31, NUMPY_WIDTH, NUMPY_WIDTH + 1])
+def test_generated_boards_are_solvable_and_unsolved(n):
+    rng = random.Random(n)
+    for _ in range(50):
+        puzzle = generate_new_puzzle(n, rng)
+        assert sorted(puzzle) == list(range(n * n))
+        assert is_solvable(puzzle, n) and not is_solved(puzzle)
+
+
+def test_board_width():
+    assert board_width(range(16)) == 4
+    with pytest.raises(ValueError):
+        board_width(range(15))
+
+
+def test_shuffled_board_parity():
+    for seed in range(200):
+        board, parity = shuffled_board(9, seed)
+        assert sorted(board) == list(range(9))
+        assert parity == inversions(board) % 2
+
+
+def test_shuffled_board_is_uniform():
+    # 24,000 draws of the 24 orders of four: each expected 1,000 times, 5 standard deviations is 155
+    counts = collections.Counter(tuple(shuffled_board(4, seed)[0]) for seed in range(24000))
+    assert len(counts) == 24
+    assert all(abs(count - 1000) < 155 for count in counts.values())
+
+
+def test_large_boards_repeat_with_the_seed():
+    assert generate_new_puzzle(40, random.Random(5)) == generate_new_puzzle(40, random.Random(5))
@@ -0,0 +1,81 @@
+"""
+The free-cell set, the occupancy counts and the flow field, up to grids past 65,536 cells.
+"""
+import random
+
+import pytest
+
+from snake_core.flow import UNREACHED, FlowField
+from snake_core.grid import FreeCells, OccupancyGrid, SnakeBody
+
+
+def check(free, expected):
+    assert len(free) == len(expected)
+    assert set(free.cells) == expected
+    for cell in range(len(free.slot)):
+        assert (cell in free) == (cell in expected)
+        if cell in expected:
+            assert free.cells[free.slot[cell]] == cell
+
+
+def test_free_cells_follow_random_adds_and_discards():
+    rng = random.Random(0)
+    free, expected = FreeCells(300), set(range(300))
+    for _ in range(3000):
+        cell = rng.randrange(300)
+        if rng.random() < 0.5:
+            free.discard(cell)
+            expected.discard(cell)
+        else:
+            free.add(cell)
+            expected.add(cell)
+        check(free, expected)
+        if expected:
+            assert free.sample(rng) in expected
+
+
+def test_sample_of_no_free_cells_is_none():
+    free = FreeCells(4)
+    for cell in range(4):
+        free.discard(cell)
+        free.discard(cell)
+    assert len(free) == 0 and free.sample() is None
+
+
+def test_occupancy_keeps_free_cells():
+    grid = OccupancyGrid(5, 4)
+    body = SnakeBody(grid, grid.index(2, 2))
+    body.push_head(grid.index(3, 2))
+    body.push_head(grid.index(2, 2))  # turning back onto a covered cell
+    grid.add_food(0)
+    assert grid.snake[grid.index(2, 2)] == 2
+    assert len(grid.free) == 20 - 3
+    body.pop_tail()
+    assert grid.index(2, 2) not in grid.free
+    body.pop_tail()
+    grid.remove_food(0)
+    assert set(grid.free.cells) == set(range(20)) - {grid.index(2, 2)}
+
+
+@pytest.mark.parametrize("cols, rows", [(300, 300), (70000, 1)])
+def test_grids_past_16_bit_cell_indices(cols, rows):
+    grid = OccupancyGrid(cols, rows)
+    last = len(grid) - 1
+    grid.add_food(last)
+    assert last not in grid.free and len(grid.free) == last
+    assert grid.free.sample(random.Random(0)) < last
+    field = FlowField(grid)
+    field.update(last)
+    assert field.distance[0] == cols - 1 + rows - 1
+    assert field.next_cell(last - 1) == last
+
+
+def test_flow_field_routes_around_blocked_cells():
+    grid = OccupancyGrid(3, 3)
+    blocked = [0] * 9
+    blocked[grid.index(1, 0)] = blocked[grid.index(1, 1)] = 1
+    field = FlowField(grid)
+    field.update(grid.index(2, 0), blocked)
+    assert field.distance[grid.index(0, 0)] == 6
+    assert field.distance[grid.index(1, 1)] == 2  # a blocked cell still gets a way out
+    assert UNREACHED > len(grid)
@@ -0,0 +1,62 @@
+"""
+Ordering and timing of the fixed-tick GameLoop, driven by a fake clock.
+"""
+from snake_core.loop import GameLoop
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_subsystems_keep_their_own_rates():
+    loop = GameLoop(10, clock=FakeClock())
+    runs = []
+    loop.add(lambda: runs.append(("fast", loop.now_ms)) or 20)
+    loop.add(lambda: runs.append(("slow", loop.now_ms)) or 50)
+    for _ in range(10):
+        loop.run_tick()
+    # both are due at 0, which the first tick reaches at 10, then they keep to their rates from 0
+    assert [t for name, t in runs if name == "fast"] == [10, 20, 40, 60, 80, 100]
+    assert [t for name, t in runs if name == "slow"] == [10, 50, 100]
+
+
+def test_due_subsystems_run_in_time_then_insertion_order():
+    loop = GameLoop(10, clock=FakeClock())
+    runs = []
+    for name in "abc":
+        loop.add(lambda name=name: runs.append(name) or 30)
+    loop.add(lambda: runs.append("d") or 20, delay_ms=0)
+    for _ in range(4):
+        loop.run_tick()
+    # at 10 ms everything runs in the order added, then d at 20 and 40, a, b and c at 30
+    assert runs == ["a", "b", "c", "d", "d", "a", "b", "c", "d"]
+
+
+def test_returning_none_stops_a_subsystem():
+    loop = GameLoop(10, clock=FakeClock())
+    runs = []
+    loop.add(lambda: runs.append(loop.now_ms) or (None if len(runs) == 3 else 20))
+    for _ in range(6):
+        loop.run_tick()
+    assert runs == [10, 20, 40]
+    assert len(loop) == 0
+
+
+def test_advance_catches_up_and_skips_long_stalls():
+    clock = FakeClock()
+    loop = GameLoop(10, clock=clock, max_catch_up=5)
+    ticks = []
+    loop.add(lambda: ticks.append(loop.now_ms) or 20)
+    clock.now = 0.035
+    assert loop.advance()
+    assert loop.now_ms == 30 and ticks == [10, 20]
+    # a one-second stall replays only max_catch_up ticks
+    clock.now = 1.035
+    loop.advance()
+    assert loop.now_ms == 80 and ticks == [10, 20, 40, 60, 80]
+    # 5 ms to the next tick boundary, rounded up through float seconds
+    assert 5 <= loop.next_delay_ms() <= 6
@@ -0,0 +1,55 @@
+"""
+The 3x3 oracle's board numbering and distances, against a breadth-first search.
+"""
+import random
+
+import pytest
+
+from puzzle_core.bitboard import decode, distances
+from puzzle_core.generator import generate_new_puzzle, is_solvable
+from puzzle_core.oracle import PATH, STATES, open_oracle, rank, unrank
+
+
+def test_every_index_round_trips():
+    seen = set()
+    for index in range(0, STATES, 7):
+        board = unrank(index)
+        assert sorted(board) == list(range(9)) and is_solvable(board, 3)
+        assert rank(board) == index
+        seen.add(tuple(board))
+    assert len(seen) == len(range(0, STATES, 7))
+
+
+def test_unsolvable_boards_have_no_index():
+    with pytest.raises(ValueError):
+        rank([2, 1, 3, 4, 5, 6, 7, 8, 0])
+
+
+def test_distances_match_search(oracle):
+    rng = random.Random(0)
+    for state, depth in rng.sample(sorted(distances(3).items()), 500):
+        assert oracle.distance(decode(state, 3)) == depth
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_solution_is_optimal(oracle, seed):
+    board = generate_new_puzzle(3, random.Random(seed))
+    moves = oracle.solution(board)
+    assert len(moves) == oracle.distance(board)
+    for move in moves:
+        blank = board.index(0)
+        board[blank], board[move] = board[move], 0
+    assert board == [*range(1, 9), 0]
+    assert oracle.next_move(board) is None
+
+
+def test_shipped_table_matches_a_fresh_build(oracle):
+    with open(PATH, "rb") as f:
+        assert f.read() == bytes(oracle.table)
+
+
+def test_cut_short_file_is_built_again(tmp_path):
+    path = tmp_path / "oracle3x3.bin"
+    path.write_bytes(bytes(100))
+    assert open_oracle(str(path)).distance([1, 2, 3, 4, 5, 6, 7, 0, 8]) == 1
+    assert path.stat().st_size == STATES
@@ -0,0 +1,58 @@
+"""
+Binary game logs, and replaying them through a GameLoop.
+"""
+import io
+
+import pytest
+
+from snake_core.loop import GameLoop
+from snake_core.replay import EVENTS, HEADER, RECORD, Recorder, read_log, replay
+
+
+class KeptOpen(io.BytesIO):
+    def close(self):
+        pass  # keep the bytes readable after Recorder.close()
+
+
+def record(seed, events, end_ms):
+    stream = KeptOpen()
+    recorder = Recorder(stream, seed)
+    for time_ms, event in events:
+        recorder.record(time_ms, event)
+    recorder.close(end_ms)
+    return stream.getvalue()
+
+
+def test_round_trip():
+    events = [(0, "start"), (40, "Up"), (40, "Left"), (1000, "space"), (65535, "Right")]
+    data = record(2 ** 64 - 1, events, 70000)
+    assert len(data) == HEADER.size + RECORD.size * (len(events) + 1)
+    seed, read = read_log(io.BytesIO(data))
+    assert seed == 2 ** 64 - 1
+    assert read == events + [(70000, "end")]
+    assert {event for _, event in read} <= set(EVENTS)
+
+
+@pytest.mark.parametrize("seed", [-1, 2 ** 64])
+def test_seed_out_of_range(seed):
+    with pytest.raises(ValueError):
+        Recorder(KeptOpen(), seed)
+
+
+def test_truncated_and_foreign_logs():
+    data = record(1, [(0, "start")], 10)
+    with pytest.raises(ValueError):
+        read_log(io.BytesIO(data[:-RECORD.size]))
+    with pytest.raises(ValueError):
+        read_log(io.BytesIO(b"XXXX" + data[4:]))
+
+
+def test_replay_applies_inputs_before_their_tick():
+    loop = GameLoop(20, clock=lambda: 0.0)
+    seen = []
+    loop.add(lambda: seen.append(("tick", loop.now_ms)) or 40)
+    events = [(0, "start"), (40, "Up"), (50, "Left"), (100, "end")]
+    ticks = replay(loop, events, lambda event: seen.append((event, loop.now_ms)))
+    # an input is applied once the loop has reached its time, before the next tick runs
+    assert ticks == 5
+    assert seen == [("start", 0), ("tick", 20), ("tick", 40), ("Up", 40), ("Left", 60), ("tick", 80)]
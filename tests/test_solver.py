@@ -0,0 +1,86 @@
+"""
+Solved paths of the IDA* solver and the text game's hint and solve commands, checked with check_win.
+"""
+import random
+
+import pytest
+
+from puzzle_core.bitboard import encode
+from puzzle_core.generator import generate_new_puzzle
+from puzzle_core.solver import default_heuristic, neighbour_table, search, solve
+
+BOARDS = [generate_new_puzzle(3, random.Random(seed)) for seed in range(12)]
+STEPS = neighbour_table(3)
+
+
+def play(puzzle, moves):
+    """
+    Return the board after the moves, checking that each one is legal.
+    """
+    board = list(puzzle)
+    for move in moves:
+        blank = board.index(0)
+        assert move in STEPS[blank]
+        board[blank], board[move] = board[move], 0
+    return board
+
+
+@pytest.mark.parametrize("puzzle", BOARDS)
+def test_solution_wins(text_game, puzzle):
+    moves = solve(puzzle)
+    assert not text_game.check_win(encode(puzzle))
+    assert text_game.check_win(encode(play(puzzle, moves)))
+    assert len(moves) >= default_heuristic(3).estimate(puzzle)
+
+
+def test_solved_board_needs_no_moves(text_game):
+    goal = [*range(1, 9), 0]
+    assert solve(goal) == []
+    assert text_game.check_win(encode(goal))
+
+
+def test_known_optimal_length():
+    # one and two slides away from the goal, and every tile shifted one cell on, which takes 22
+    assert len(solve([1, 2, 3, 4, 5, 0, 7, 8, 6])) == 1
+    assert len(solve([1, 2, 3, 4, 0, 5, 7, 8, 6])) == 2
+    assert len(solve([0, 1, 2, 3, 4, 5, 6, 7, 8])) == 22
+
+
+def test_unsolvable_board_is_rejected():
+    with pytest.raises(ValueError):
+        solve([2, 1, 3, 4, 5, 6, 7, 8, 0])
+
+
+def test_node_budget():
+    with pytest.raises(RuntimeError):
+        search(BOARDS[0], max_nodes=1)
+
+
+def test_following_hints_wins(text_game, oracle, monkeypatch):
+    monkeypatch.setattr(text_game, "oracle", oracle)
+    monkeypatch.setattr(text_game, "say", lambda *args, **kwargs: None)
+    monkeypatch.setattr(text_game, "read", lambda prompt="": "adws")
+    moves, letters = {}, []
+    assert text_game.enter_letters(moves, letters)
+    table = text_game.letter_table(moves, letters)
+    for puzzle in BOARDS[:4]:
+        state, empty = encode(puzzle), puzzle.index(0)
+        count = 0
+        while not text_game.check_win(state):
+            move = table[empty][1][text_game.hint_letter(state, table, empty)]
+            state = text_game.person_move(state, move)
+            empty = move[0]
+            count += 1
+        assert count == len(solve(puzzle))
+
+
+def test_script_solve_command(text_game, oracle, monkeypatch, capsys):
+    monkeypatch.setattr(text_game, "oracle", oracle)
+    monkeypatch.setattr(text_game, "say", text_game.say)
+    monkeypatch.setattr(text_game, "read", text_game.read)
+    text_game.run_script(["adws\n", "solve\n", "w solve\n", "\n"], seed=7)
+    out = capsys.readouterr().out.splitlines()
+    assert out[0].startswith("game 1: solved in ")
+    assert out[1].startswith("game 2: solved in ")
+    assert out[2].startswith("game 3: unsolved in 0 moves")
+    assert out[3].startswith("3 games, 2 solved")
@@ -0,0 +1,61 @@
+"""
+The batched snake games: shapes, resets and grids too small for the default spawn distances.
+"""
+import numpy as np
+import pytest
+
+from snake_core.vector import FOOD_NUMBER, MIN_SIZE, MONSTER_NUMBER, OBSERVATION_SIZE, VectorSnake
+
+
+def test_step_and_reset_shapes():
+    env = VectorSnake(8, seed=0)
+    obs = env.reset()
+    assert obs.shape == (8, OBSERVATION_SIZE) and obs.dtype == np.int16
+    obs, reward, done = env.step(np.zeros(8, dtype=np.intp))
+    assert obs.shape == (8, OBSERVATION_SIZE)
+    assert reward.shape == (8,) and reward.dtype == np.float32
+    assert done.shape == (8,) and done.dtype == bool
+    assert env.boards().shape == (8, env.size * env.size)
+
+
+def test_reset_restarts_only_the_given_rows():
+    env = VectorSnake(4, seed=1)
+    for _ in range(3):
+        env.step(np.full(4, 1))
+    env.reset(np.array([2]))
+    assert env.steps.tolist() == [3, 3, 0, 3]
+    assert env.length[2] == 1 and env.food_left[2] == FOOD_NUMBER
+
+
+@pytest.mark.parametrize("size", range(MIN_SIZE, 20))
+def test_small_grids_stay_on_the_board(size):
+    env = VectorSnake(64, seed=size, size=size)
+    start = (size // 2 + 1) * size + size // 2
+    cells = size * size
+    for _ in range(200):
+        assert ((env.monsters >= 0) & (env.monsters < cells)).all()
+        assert env.monsters.shape == (64, MONSTER_NUMBER)
+        env.step(env.rng.integers(0, 4, 64))
+    env.reset()
+    assert not (env.food_cells == start).any()
+    assert (env.food[:, start] == 0).all()
+
+
+def test_grids_below_the_minimum_are_rejected():
+    with pytest.raises(ValueError):
+        VectorSnake(1, size=MIN_SIZE - 1)
+
+
+@pytest.mark.parametrize("body_col, contacts", [(13, 1), (12, 1), (15, 0)])
+def test_monster_next_to_the_body_counts(body_col, contacts):
+    env = VectorSnake(1, seed=0)
+    size = env.size
+    env.snake[:] = 0
+    env.head[0] = 13 * size + 12
+    env.monsters[0] = 17 * size + 12  # straight above the head, it steps down to row 16
+    env.snake[0, 16 * size + body_col] = 1
+    moving = np.zeros((1, MONSTER_NUMBER), dtype=bool)
+    moving[0, 0] = True
+    env._move_monsters(moving, np.zeros(1, dtype=np.float32))
+    assert env.monsters[0, 0] == 16 * size + 12
+    assert env.contacts[0] == contacts